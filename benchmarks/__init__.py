@@ -0,0 +1,3 @@
+"""
+Description: Performance benchmarks for pmr_elirobots_sdk, run against local stand-in controllers
+"""
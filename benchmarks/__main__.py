@@ -0,0 +1,7 @@
+"""
+Description: Run the hot path benchmark suite, ``python -m benchmarks --help``
+"""
+
+from benchmarks.bench_hot_paths import main
+
+main()
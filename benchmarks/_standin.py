@@ -0,0 +1,44 @@
+"""
+Description: Simulated controllers running in their own process for benchmarks
+"""
+
+import multiprocessing
+import time
+from typing import Optional
+
+from pmr_elirobots_sdk.simulator import ECSimulator
+
+
+def _serve(
+    host: str, port: int, monitor_port: Optional[int], latency: float, period: float
+) -> None:
+    ECSimulator(host, port, monitor_port, latency, period).serve_forever()
+
+
+def start_standin(
+    host: str,
+    port: int = 8055,
+    latency: float = 0.001,
+    monitor_port: Optional[int] = 8056,
+    period: float = 0.008,
+):
+    """Start a simulated controller in its own process, off the benchmark's GIL
+
+    Args
+    ----
+        host (str): Address to listen on, e.g. 127.0.0.2 to emulate a second robot
+        port (int, optional): Port to listen on. Defaults to 8055.
+        latency (float, optional): Delay of each reply in seconds. Defaults to 0.001.
+        monitor_port (Optional[int], optional): 8056 port, None disables it. Defaults to 8056.
+        period (float, optional): Seconds between 8056 frames, 0 for no pause. Defaults to 0.008.
+
+    Returns
+    -------
+        multiprocessing.Process: Server process, terminate it when done
+    """
+    proc = multiprocessing.Process(
+        target=_serve, args=(host, port, monitor_port, latency, period), daemon=True
+    )
+    proc.start()
+    time.sleep(0.2)
+    return proc
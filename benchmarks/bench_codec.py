@@ -0,0 +1,85 @@
+"""
+Description: Reply decoding cost on port 8055 for each JSON codec
+
+Replies below follow the controller wire format, where `result` holds the
+JSON encoded value as a string. Run with ``python -m benchmarks.bench_codec``
+"""
+
+import argparse
+import json
+import timeit
+from functools import partial
+
+from pmr_elirobots_sdk._codec import ORJSON_CODEC, STDLIB_CODEC
+
+REPLIES = [
+    b'{"jsonrpc":"2.0","result":"0","id":1}',  # getRobotState
+    b'{"jsonrpc":"2.0","result":"2","id":2}',  # getRobotMode
+    b'{"jsonrpc":"2.0","result":"true","id":3}',  # getServoStatus
+    b'{"jsonrpc":"2.0","result":"12.5","id":4}',  # get_tcp_speed
+    b'{"jsonrpc":"2.0","result":"[0.0,-90.00012,90.0,-90.0,90.0,0.0,0.0,0.0]","id":5}',
+    b'{"jsonrpc":"2.0","result":"[-116.42876928044629,-445.8173561092616,'
+    b"330.01911829033054,-2.528732975547022,-0.23334446132951653,"
+    b'2.9722706513750343]","id":6}',  # get_tcp_pose
+    b'{"jsonrpc":"2.0","result":"{\\"m\\":1.5,\\"tool_cog\\":[0.0,0.0,45.0]}","id":7}',
+    b'{"jsonrpc":"2.0","error":{"code":-32601,"message":"Method not found"},"id":8}',
+]
+
+
+def _decode_stdlib_two_pass(frame: bytes):
+    """Decoding done by send_CMD before codecs were introduced"""
+    jdata = json.loads(str(frame, "utf-8"))
+    if "result" in jdata:
+        return json.loads(jdata["result"])
+    return jdata["error"]["message"]
+
+
+def _decoder(codec):
+    loads, loads_result = codec.loads, codec.loads_result
+
+    def decode(frame: bytes):
+        jdata = loads(frame)
+        if "result" in jdata:
+            return loads_result(jdata["result"])
+        return jdata["error"]["message"]
+
+    return decode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    decoders = {"json_two_pass": _decode_stdlib_two_pass}
+    decoders["json"] = _decoder(STDLIB_CODEC)
+    if ORJSON_CODEC is not None:
+        decoders["orjson"] = _decoder(ORJSON_CODEC)
+
+    for frame in REPLIES:
+        expected = _decode_stdlib_two_pass(frame)
+        assert all(decode(frame) == expected for decode in decoders.values())
+
+    def run_all(decode):
+        for frame in REPLIES:
+            decode(frame)
+
+    baseline = None
+    for name, decode in decoders.items():
+        best = min(
+            timeit.repeat(partial(run_all, decode), number=args.number, repeat=5)
+        )
+        ns = best / (args.number * len(REPLIES)) * 1e9
+        if baseline is None:
+            baseline = ns
+        result = {
+            "benchmark": "decode",
+            "codec": name,
+            "ns_per_reply": round(ns),
+            "speedup": round(baseline / ns, 2),
+        }
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
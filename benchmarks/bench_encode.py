@@ -0,0 +1,83 @@
+"""
+Description: Request encoding cost of streaming 8055 commands for each codec
+
+Compares the request encoding used before templates, `json.dumps` of the whole
+request, with the encoding the SDK uses for each codec: `CmdTemplate` for the
+stdlib codec, the whole request for orjson.
+
+Run with ``python -m benchmarks.bench_encode``
+"""
+
+import argparse
+import json
+import timeit
+
+from pmr_elirobots_sdk import EC
+from pmr_elirobots_sdk._codec import ORJSON_CODEC, STDLIB_CODEC
+from pmr_elirobots_sdk._template import CmdTemplate
+
+JOINT = [12.345678, -45.5, 90.123, -0.5, 33.3333, 180.0]
+
+CASES = [
+    (
+        "tt_put_servo_joint_to_buf",
+        {"targetPos": JOINT},
+        CmdTemplate("tt_put_servo_joint_to_buf", "targetPos"),
+        (JOINT,),
+    ),
+    (
+        "push_pos",
+        {"timestamp": 0.008, "pos": JOINT},
+        CmdTemplate("push_pos", "timestamp", "pos"),
+        (0.008, JOINT),
+    ),
+    (
+        "moveBySpeedj",
+        {"vj": JOINT + [0.0, 0.0], "acc": 50, "t": 0.1},
+        CmdTemplate("moveBySpeedj", "vj", "acc", "t"),
+        (JOINT + [0.0, 0.0], 50, 0.1),
+    ),
+]
+
+
+def _ns_per_call(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    ec = EC(enable_log=False)
+    codecs = [STDLIB_CODEC] + ([ORJSON_CODEC] if ORJSON_CODEC is not None else [])
+    for cmd, params, template, values in CASES:
+        ec.codec = STDLIB_CODEC
+        expected = json.loads(ec._encode_request(cmd, params, 1))
+
+        def encode_request(cmd=cmd, params=params):
+            return ec._encode_request(cmd, params, 1)
+
+        def encode_template(template=template, values=values):
+            return template.encode(1, *values, codec=ec.codec)
+
+        baseline = _ns_per_call(encode_request, args.number)
+        for codec in codecs:
+            ec.codec = codec
+            encode = encode_request if codec.dumps_value is None else encode_template
+            assert json.loads(encode()) == expected
+            ns = _ns_per_call(encode, args.number)
+            result = {
+                "benchmark": "encode",
+                "cmd": cmd,
+                "codec": codec.name,
+                "encoder": "dumps" if encode is encode_request else "template",
+                "json_dumps_ns": round(baseline),
+                "ns": round(ns),
+                "speedup": round(baseline / ns, 2),
+            }
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
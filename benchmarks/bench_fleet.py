@@ -0,0 +1,76 @@
+"""
+Description: CPU cost of monitoring many robots, thread per robot vs MonitorFleet
+
+Every robot is a stand-in controller streaming 8056 frames every 8 ms on its own
+loopback address. The CPU time of this process is measured while monitoring
+them with one `monitor_thread_run` thread each, then with a single
+`MonitorFleet` selector thread.
+
+Run with ``python -m benchmarks.bench_fleet``
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from benchmarks._standin import start_standin
+from pmr_elirobots_sdk import EC, MonitorFleet
+
+
+def _host(i: int) -> str:
+    return f"127.0.1.{i + 1}"
+
+
+def _wait_first_frames(ecs: List[EC]) -> None:
+    while not all(getattr(ec, "_monitor_recv_flag", False) for ec in ecs):
+        time.sleep(0.01)
+
+
+def _measure(ecs: List[EC], duration: float) -> dict:
+    """CPU time and frames received by this process during `duration`"""
+    _wait_first_frames(ecs)
+    frames = sum(ec._tt for ec in ecs)
+    cpu, wall = time.process_time(), time.perf_counter()
+    time.sleep(duration)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    frames = sum(ec._tt for ec in ecs) - frames
+    return {
+        "cpu_percent": round(cpu / wall * 100, 1),
+        "frames_per_s": round(frames / wall, 1),
+        "cpu_us_per_frame": round(cpu / frames * 1e6, 1),
+    }
+
+
+def run(robots: int, duration: float, model: str) -> dict:
+    ecs = [EC(ip=_host(i), enable_log=False) for i in range(robots)]
+    if model == "threads":
+        for ec in ecs:
+            ec.monitor_thread_run()
+        result = _measure(ecs, duration)
+        for ec in ecs:
+            ec.monitor_thread_stop()
+    else:
+        with MonitorFleet(ecs):
+            result = _measure(ecs, duration)
+    return {"benchmark": "fleet_monitor", "robots": robots, "model": model, **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--robots", type=int, nargs="+", default=[1, 8, 20])
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    servers = [start_standin(_host(i)) for i in range(max(args.robots))]
+    try:
+        for n in args.robots:
+            for model in ("threads", "fleet"):
+                print(json.dumps(run(n, args.duration, model)), flush=True)
+    finally:
+        for proc in servers:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
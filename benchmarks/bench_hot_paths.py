@@ -0,0 +1,271 @@
+"""
+Description: Throughput and latency of the SDK hot paths against simulated controllers
+
+Measures send_CMD round trips, pipelined submit_CMD, batched getters,
+TT_add_joint streaming with and without replies, ml_push uploads, monitor
+frames decoded per second and wait_stop detection latency. One JSON object is
+printed per result.
+
+Run with ``python -m benchmarks`` or ``python -m benchmarks.bench_hot_paths``
+"""
+
+import argparse
+import json
+import threading
+import time
+from importlib import metadata
+from typing import Callable, Dict, Iterator, List
+
+from benchmarks._standin import start_standin
+from pmr_elirobots_sdk import EC
+from pmr_elirobots_sdk.simulator import ECSimulator
+
+CMD_HOST = "127.0.0.1"
+MONITOR_HOST = "127.0.0.2"  # Streams frames back to back instead of every 8 ms
+
+JOINT = [12.345678, -45.5, 90.123, -0.5, 33.3333, 180.0]
+# Subset decoded by typical consumers, see EC.set_monitor_fields
+MONITOR_FIELDS = ["machinePos", "robotState", "digital_ioInput"]
+
+
+def _sdk_version() -> str:
+    try:
+        return metadata.version("pmr_elirobots_sdk")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _connect(host: str) -> EC:
+    ec = EC(ip=host, enable_log=False)
+    if not ec.connect_ETController(host)[0]:
+        raise ConnectionError(f"No simulated controller on {host}")
+    return ec
+
+
+def bench_send_cmd(duration: float) -> Iterator[dict]:
+    """Sequential send_CMD round trips"""
+    ec = _connect(CMD_HOST)
+    n = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        ec.send_CMD("getRobotState")
+        n += 1
+    elapsed = time.perf_counter() - start
+    ec.disconnect_ETController()
+    yield {
+        "benchmark": "send_cmd",
+        "calls_per_s": round(n / elapsed, 1),
+        "mean_rtt_us": round(elapsed / n * 1e6, 1),
+    }
+
+
+def bench_pipelined(duration: float, depth: int) -> Iterator[dict]:
+    """Groups of getters awaited one by one, then submitted back to back"""
+    ec = _connect(CMD_HOST)
+
+    def serial() -> None:
+        for _ in range(depth):
+            ec.send_CMD("getRobotState")
+
+    def pipelined() -> None:
+        for pending in [ec.submit_CMD("getRobotState") for _ in range(depth)]:
+            pending.wait()
+
+    for mode, run in (("serial", serial), ("pipelined", pipelined)):
+        n = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        while time.perf_counter() < deadline:
+            run()
+            n += 1
+        elapsed = time.perf_counter() - start
+        yield {
+            "benchmark": "pipelined",
+            "mode": mode,
+            "depth": depth,
+            "groups_per_s": round(n / elapsed, 1),
+            "mean_group_us": round(elapsed / n * 1e6, 1),
+        }
+    ec.disconnect_ETController()
+
+
+def bench_batch(duration: float) -> Iterator[dict]:
+    """DH_parameters sent as one send_many batch against its 11 getters in turn
+
+    `round_trips` divides the time per call by a single send_CMD round trip,
+    a batch costs about one round trip instead of one per command.
+    """
+    ec = _connect(CMD_HOST)
+    cmds = [("getDH", {"index": i}) for i in range(11)]
+
+    def serial() -> None:
+        for cmd, params in cmds:
+            ec.send_CMD(cmd, params)
+
+    modes = (
+        ("single", lambda: ec.send_CMD("getRobotState")),
+        ("serial", serial),
+        ("send_many", lambda: ec.DH_parameters),
+    )
+    rtt = None
+    for mode, run in modes:
+        n = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        while time.perf_counter() < deadline:
+            run()
+            n += 1
+        mean = (time.perf_counter() - start) / n
+        if rtt is None:
+            rtt = mean
+        yield {
+            "benchmark": "batch",
+            "mode": mode,
+            "commands": 1 if mode == "single" else len(cmds),
+            "mean_us": round(mean * 1e6, 1),
+            "round_trips": round(mean / rtt, 2),
+        }
+    ec.disconnect_ETController()
+
+
+def bench_tt_add_joint(points: int) -> Iterator[dict]:
+    """Transparent transmission points streamed with and without replies"""
+    ec = _connect(CMD_HOST)
+    ec.set_servo_status(1)
+    for response_enable in (1, 0):
+        ec.TT_init(t=8, response_enable=response_enable)
+        start = time.perf_counter()
+        for _ in range(points):
+            ec.TT_add_joint(JOINT)
+        _ = ec.TT_state  # Replied to after all the points sent before it
+        elapsed = time.perf_counter() - start
+        ec.TT_clear_buff()
+        yield {
+            "benchmark": "tt_add_joint",
+            "response_enable": response_enable,
+            "points": points,
+            "points_per_s": round(points / elapsed, 1),
+        }
+    ec.disconnect_ETController()
+
+
+def bench_ml_push(points: int) -> Iterator[dict]:
+    """Upload of a timestamped trajectory, with and without replies per point"""
+    ec = _connect(CMD_HOST)
+    for ret_flag in (1, 0):
+        ec.ml_init(points, 0, JOINT + [0.0, 0.0], [0.0] * 6, ret_flag)
+        start = time.perf_counter()
+        for i in range(points):
+            ec.ml_push(i * 0.008, JOINT)
+        ec.ml_end_push()
+        elapsed = time.perf_counter() - start
+        ec.ml_flush()
+        yield {
+            "benchmark": "ml_push",
+            "ret_flag": ret_flag,
+            "points": points,
+            "upload_s": round(elapsed, 4),
+            "points_per_s": round(points / elapsed, 1),
+        }
+    ec.disconnect_ETController()
+
+
+def bench_monitor(duration: float) -> Iterator[dict]:
+    """8056 frames received and decoded per second by monitor_run"""
+    for fields in (None, MONITOR_FIELDS):
+        ec = EC(ip=MONITOR_HOST, enable_log=False)
+        ec.set_monitor_fields(fields)
+        thread = threading.Thread(target=ec.monitor_run, daemon=True)
+        thread.start()
+        while not getattr(ec, "_monitor_recv_flag", False):
+            time.sleep(0.01)
+
+        start_frames, start = ec._tt, time.perf_counter()
+        time.sleep(duration)
+        frames, elapsed = ec._tt - start_frames, time.perf_counter() - start
+        ec.monitor_run_state = False
+        thread.join(1)
+        yield {
+            "benchmark": "monitor_decode",
+            "fields": "all" if fields is None else ",".join(fields),
+            "frames_per_s": round(frames / elapsed, 1),
+            "us_per_frame": round(elapsed / frames * 1e6, 2),
+        }
+
+
+def bench_wait_stop(trials: int) -> Iterator[dict]:
+    """Delay between the end of a blocking move and move_joint returning"""
+    ec = _connect(CMD_HOST)
+    ec.set_servo_status(1)
+    speed, distance = 50, 9.0
+    duration = distance / (ECSimulator.max_joint_speed * speed / 100)
+    ec.move_joint([0.0] * 6, 100)  # Earlier benchmarks moved the robot
+
+    # Polling getRobotState on port 8055 first, then woken by the monitor thread
+    for source in ("8055", "8056"):
+        if source == "8056":
+            ec.monitor_thread_run()
+            while not ec._monitor_recv_flag:
+                time.sleep(0.01)
+        metrics = ec.enable_metrics()
+        metrics.reset()
+
+        delays: List[float] = []
+        for i in range(trials):
+            target = [distance if i % 2 == 0 else 0.0] + [0.0] * 5
+            start = time.perf_counter()
+            ec.move_joint(target, speed)
+            delays.append(time.perf_counter() - start - duration)
+
+        delays.sort()
+        polls = metrics.snapshot().get("getRobotState")
+        yield {
+            "benchmark": "wait_stop",
+            "source": source,
+            "trials": trials,
+            "median_ms": round(delays[len(delays) // 2] * 1000, 2),
+            "max_ms": round(delays[-1] * 1000, 2),
+            "state_polls": 0 if polls is None else polls.count,
+        }
+    ec.monitor_thread_stop()
+    ec.disconnect_ETController()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run, all by default")
+    args = parser.parse_args()
+
+    benchmarks: Dict[str, Callable[[], Iterator[dict]]] = {
+        "send_cmd": lambda: bench_send_cmd(args.duration),
+        "pipelined": lambda: bench_pipelined(args.duration, args.depth),
+        "batch": lambda: bench_batch(args.duration),
+        "tt_add_joint": lambda: bench_tt_add_joint(args.points),
+        "ml_push": lambda: bench_ml_push(args.points),
+        "monitor_decode": lambda: bench_monitor(args.duration),
+        "wait_stop": lambda: bench_wait_stop(args.trials),
+    }
+    selected = args.only or list(benchmarks)
+
+    servers = [
+        start_standin(CMD_HOST, latency=args.latency),
+        start_standin(MONITOR_HOST, latency=args.latency, period=0.0),
+    ]
+    common = {"sdk_version": _sdk_version(), "latency_s": args.latency}
+    try:
+        for name in selected:
+            for result in benchmarks[name]():
+                print(json.dumps({**result, **common}), flush=True)
+    finally:
+        for proc in servers:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
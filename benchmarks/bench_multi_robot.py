@@ -0,0 +1,86 @@
+"""
+Description: Aggregate 8055 command throughput with one thread per robot
+
+Each robot is a stand-in controller listening on its own loopback address
+(127.0.0.1, 127.0.0.2, ...). With per-connection locking the aggregate
+throughput should grow roughly linearly with the number of robots.
+
+Run with ``python -m benchmarks.bench_multi_robot``
+"""
+
+import argparse
+import json
+import threading
+import time
+from typing import List
+
+from benchmarks._standin import start_standin
+from pmr_elirobots_sdk import EC
+
+
+def _hammer(ec: EC, deadline: float, counts: List[int], idx: int) -> None:
+    n = 0
+    while time.perf_counter() < deadline:
+        ec.send_CMD("getRobotState")
+        n += 1
+    counts[idx] = n
+
+
+def run(robots: int, duration: float, thread_safe: bool = True) -> float:
+    """Command throughput (calls/s) summed over `robots` robots, one thread each"""
+    ecs = []
+    for i in range(robots):
+        ip = f"127.0.0.{i + 1}"
+        ec = EC(ip=ip, enable_log=False, thread_safe=thread_safe)
+        ec.connect_ETController(ip)
+        ecs.append(ec)
+
+    counts = [0] * robots
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_hammer, args=(ec, deadline, counts, i))
+        for i, ec in enumerate(ecs)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for ec in ecs:
+        ec.disconnect_ETController()
+    return sum(counts) / duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--robots", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.001)
+    args = parser.parse_args()
+
+    servers = [
+        start_standin(f"127.0.0.{i + 1}", latency=args.latency)
+        for i in range(max(args.robots))
+    ]
+    try:
+        single = None
+        for n in args.robots:
+            for thread_safe in (True, False):
+                rate = run(n, args.duration, thread_safe)
+                if single is None:
+                    single = rate
+                result = {
+                    "benchmark": "multi_robot_throughput",
+                    "robots": n,
+                    "thread_safe": thread_safe,
+                    "calls_per_s": round(rate, 1),
+                    "scaling": round(rate / single, 2),
+                }
+                print(json.dumps(result))
+    finally:
+        for proc in servers:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,11 @@ LastEditTime: 2022-05-10 14:53:32
 Description:
 """
 
-__all__ = ["EC"]
+__all__ = ["EC", "AsyncEC", "MonitorFleet"]
 
 __version__ = "0.0.1"
 
 
+from pmr_elirobots_sdk._asyncec import AsyncEC
 from pmr_elirobots_sdk._ec import _EC as EC
+from pmr_elirobots_sdk._fleet import MonitorFleet
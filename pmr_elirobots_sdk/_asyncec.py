@@ -0,0 +1,614 @@
+"""
+Description: asyncio implementation of the EC robot class
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import inspect
+import itertools
+import socket
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pmr_elirobots_sdk._baseec import BaseEC
+from pmr_elirobots_sdk._info import ECInfo
+from pmr_elirobots_sdk._kinematics import ECKinematics
+from pmr_elirobots_sdk._move import ECMove
+from pmr_elirobots_sdk._moveml import ECMoveML
+from pmr_elirobots_sdk._movett import ECMoveTT
+from pmr_elirobots_sdk._profinet import ECProfinet
+from pmr_elirobots_sdk._servo import ECServo
+from pmr_elirobots_sdk._template import CmdTemplate
+from pmr_elirobots_sdk._var import ECIO, ECVar
+from pmr_elirobots_sdk.types import CmdResponse
+
+
+async def _resolve(ret: Any) -> Any:
+    """Await the return value of an inherited interface when it is awaitable"""
+    if inspect.isawaitable(ret):
+        return await ret
+    return ret
+
+
+class _AsyncPendingCmd:
+    """Command in flight on port 8055 whose reply resolves an asyncio future"""
+
+    __slots__ = ("cmd", "id", "future")
+
+    def __init__(self, cmd: str, id: int, future: "asyncio.Future[CmdResponse]"):
+        self.cmd = cmd
+        self.id = id
+        self.future = future
+
+
+class AsyncEC(
+    ECServo,
+    ECInfo,
+    ECKinematics,
+    ECMove,
+    ECMoveML,
+    ECMoveTT,
+    ECProfinet,
+    ECVar,
+    ECIO,
+):
+    """EC robot class over asyncio streams
+
+    Implements the same interfaces as `EC`, but every command returns an awaitable
+    instead of blocking the calling thread. Commands are written to the socket as
+    soon as they are called, so concurrent queries to one or many robots are all
+    in flight at the same time on a single event loop.
+
+    Examples
+    --------
+    >>> async with AsyncEC(ip="192.168.1.200") as ec:
+    >>>     state, joint = await asyncio.gather(ec.state, ec.current_joint)
+    >>>     await ec.move_joint(target_joint, speed=20)
+    """
+
+    def __init__(
+        self,
+        ip: str = "192.168.1.200",
+        name: Optional[str] = "None",
+        enable_log: bool = True,
+    ) -> None:
+        """Initialize EC robot, call `connect_ETController` or use `async with` to connect
+
+        Args
+        ----
+            ip (str, optional): Robot IP. Defaults to "192.168.1.200".
+            name (Optional[str], optional): Robot name, visible when printing. Defaults to "None".
+            enable_log (bool, optional): Whether to log events in stdout. Defaults to True.
+        """
+        super().__init__()
+        self.robot_ip = ip
+        self.robot_name = name
+        self.connect_state = False
+        self.enable_log = enable_log
+        self._log_init(self.robot_ip, self.enable_log)
+        if not enable_log:
+            self.logger.disable(__name__)
+
+        self._cmd_reader: Optional[asyncio.StreamReader] = None
+        self._cmd_writer: Optional[asyncio.StreamWriter] = None
+        self._reply_task: Optional[asyncio.Task[None]] = None
+        self._pending_cmds: Dict[int, _AsyncPendingCmd] = {}
+
+    def __repr__(self) -> str:
+        return f"Elite EC6__ (asyncio), IP: {self.robot_ip}, Name: {self.robot_name}"
+
+    async def __aenter__(self) -> "AsyncEC":
+        await self.connect_ETController(self.robot_ip)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.disconnect_ETController()
+
+    async def connect_ETController(  # type: ignore[override]
+        self, ip: str, port: int = 8055, timeout: float = 2
+    ) -> tuple:
+        """Connect to EC series robot port 8055
+
+        Args:
+            ip (str): Robot IP
+            port (int, optional): SDK port number. Defaults to 8055.
+            timeout (float, optional): TCP connection timeout. Defaults to 2.
+
+        Returns
+        -------
+            [tuple]: (True/False, StreamWriter/None)
+        """
+        try:
+            self._cmd_reader, self._cmd_writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port, limit=2**20), timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            self.logger.critical(ip + " connect fail")
+            return (False, None)
+
+        # Most event loops already set it, batches must never wait for an ACK
+        sock = self._cmd_writer.get_extra_info("socket")
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.logger.debug(ip + " connect success")
+        self.connect_state = True
+        self._cmd_ids = itertools.count(1)
+        self._pending_cmds = {}
+        self._reply_task = asyncio.get_running_loop().create_task(self._read_replies())
+        return (True, self._cmd_writer)
+
+    async def disconnect_ETController(self) -> None:  # type: ignore[override]
+        """Disconnect EC robot port 8055"""
+        if self._cmd_writer is None:
+            self.logger.critical("socket already closed")
+            return
+
+        writer, self._cmd_writer = self._cmd_writer, None
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+        if self._reply_task is not None:
+            self._reply_task.cancel()
+            self._reply_task = None
+
+    @property
+    def alive(self):
+        return self._cmd_writer is not None and not self._cmd_writer.is_closing()
+
+    def send_CMD(  # type: ignore[override]
+        self,
+        cmd: str,
+        params: Optional[dict] = None,
+        id: Optional[int] = None,
+        ret_flag: bool = True,
+    ) -> "asyncio.Future[CmdResponse]":
+        """Send specified command to port 8055
+
+        The request is written immediately, the returned future resolves when the
+        reply arrives, so it does not need to be awaited for the command to run.
+
+        Args
+        ----
+            cmd (str): Command
+            params (Dict[str,Any], optional): Parameters. Defaults to None.
+            id (int, optional): Ignored, every request gets a unique id. Defaults to None.
+            ret_flag (bool, optional): Whether to receive data after sending. Defaults to True.
+
+        Returns
+        -------
+            asyncio.Future[CmdResponse]: Corresponding command return information or error message
+        """
+        if not self.alive:
+            self.logger.error("Socket invalid, connection is broken")
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(CmdResponse(False, "", ""))
+            return future
+
+        # A caller supplied id could collide with one still pending
+        id = next(self._cmd_ids)
+        send_bytes = self._encode_request(cmd, params, id)
+        return self._write_request(cmd, id, send_bytes, ret_flag)
+
+    def send_compiled_CMD(  # type: ignore[override]
+        self, template: CmdTemplate, *values: Any, ret_flag: bool = True
+    ) -> "asyncio.Future[CmdResponse]":
+        """Send a command rendered from a precompiled template to port 8055
+
+        Args
+        ----
+            template (CmdTemplate): Pre-encoded command
+            *values: Numbers or sequences of numbers, one per template slot
+            ret_flag (bool, optional): Whether to receive data after sending. Defaults to True.
+
+        Returns
+        -------
+            asyncio.Future[CmdResponse]: Corresponding command return information or error message
+        """
+        if not self.alive:
+            return self.send_CMD(template.cmd)
+
+        id = next(self._cmd_ids)
+        send_bytes = template.encode(id, *values, codec=self.codec)
+        if self.send_recv_info_print:  # print send msg
+            self.logger.info(f"Send: Func is {template.cmd}")
+            self.logger.info(str(send_bytes, "utf-8"))
+        return self._write_request(template.cmd, id, send_bytes, ret_flag)
+
+    def _write_request(
+        self, cmd: str, id: int, send_bytes: bytes, ret_flag: bool
+    ) -> "asyncio.Future[CmdResponse]":
+        """Write one encoded request, returning the future of its reply"""
+        assert self._cmd_writer is not None
+
+        if not ret_flag:
+            self._cmd_writer.write(send_bytes)
+            return asyncio.ensure_future(self._drained())
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_cmds[id] = _AsyncPendingCmd(cmd, id, future)
+        self._cmd_writer.write(send_bytes)
+        return future
+
+    async def send_many(  # type: ignore[override]
+        self, cmds: Iterable[Tuple[str, Optional[dict]]]
+    ) -> List[CmdResponse]:
+        """Send several commands to port 8055 in a single write
+
+        Args
+        ----
+            cmds (Iterable[Tuple[str, Optional[dict]]]): (command, parameters) pairs
+
+        Returns
+        -------
+            List[CmdResponse]: Replies in the same order as the commands
+        """
+        if not self.alive:
+            self.logger.error("Socket invalid, connection is broken")
+            return [CmdResponse(False, "", "") for _ in cmds]
+
+        loop = asyncio.get_running_loop()
+        frames = []
+        futures = []
+        for cmd, params in cmds:
+            id = next(self._cmd_ids)
+            frames.append(self._encode_request(cmd, params, id))
+            future = loop.create_future()
+            self._pending_cmds[id] = _AsyncPendingCmd(cmd, id, future)
+            futures.append(future)
+
+        assert self._cmd_writer is not None
+        self._cmd_writer.write(b"".join(frames))
+        return list(await asyncio.gather(*futures))
+
+    async def _drained(self) -> CmdResponse:
+        """Wait for the socket write buffer to flush, throttling fire-and-forget sends"""
+        if self._cmd_writer is not None:
+            await self._cmd_writer.drain()
+        return CmdResponse(True, "", "")
+
+    async def _read_replies(self) -> None:
+        """Background task resolving the futures of pending commands"""
+        assert self._cmd_reader is not None
+        error: BaseException = ConnectionError("Connection closed by the controller")
+        try:
+            while True:
+                frame = await self._cmd_reader.readuntil(b"\n")
+                matched = self._match_reply(frame[:-1])
+                if matched is None:
+                    continue
+                pending, jdata = matched
+                if not pending.future.done():
+                    pending.future.set_result(self._parse_reply(pending.cmd, jdata))
+        except asyncio.IncompleteReadError:
+            pass
+        except (OSError, asyncio.LimitOverrunError) as e:
+            self.logger.error(f"8055 reader stopped | Exception: {e}")
+            error = e
+        finally:
+            pending_cmds, self._pending_cmds = self._pending_cmds, {}
+            for pending in pending_cmds.values():
+                if not pending.future.done():
+                    pending.future.set_exception(error)
+            if self._cmd_writer is not None:
+                self._cmd_writer.close()
+                self._cmd_writer = None
+
+    # Interfaces post-processing command results or waiting on the robot
+    async def wait_stop(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the robot motion to stop
+
+        Args
+        ----
+            timeout (float, optional): Maximum wait in seconds. Defaults to None, no limit.
+
+        Returns
+        -------
+            bool: True once the robot stopped, False if it still runs after `timeout`
+        """
+        try:
+            await asyncio.wait_for(self._poll_stop(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"The robot is still running after {timeout} s")
+            return False
+        self.logger.info("The robot has stopped")
+        return True
+
+    async def _poll_stop(self) -> None:
+        """Poll getRobotState every 5 ms until the robot leaves PLAY"""
+        while True:
+            await asyncio.sleep(0.005)
+            result = await self.state
+            if result != self.RobotState.PLAY:
+                if result != self.RobotState.STOP:
+                    str_ = [
+                        "",
+                        "Robot is in pause state",
+                        "Robot is in emergency stop state",
+                        "",
+                        "Robot is in error state",
+                        "Robot is in collision state",
+                    ]
+                    self.logger.debug(str_[result.value])
+                return
+
+    async def robot_servo_on(self, max_retries: int = 5) -> bool:
+        """Simple setup to start robot operation. Clears alarms, syncs encoders then enable servos
+
+        Args:
+            max_retries (int, optional): How many retries for each step. Defaults to 5.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.alive:
+            return False
+
+        if await self.TT_state:
+            self.logger.debug("TT state is enabled, automatically clearing TT cache")
+            await asyncio.sleep(0.5)
+            if await self.TT_clear_buff():
+                self.logger.debug("TT cache cleared")
+
+        if await self.mode != BaseEC.RobotMode.REMOTE:
+            self.logger.error("Please set Robot Mode to remote")
+            return False
+
+        clear_alarm_tries = 0
+        while (
+            clear_alarm_tries < max_retries
+            and await self.state != BaseEC.RobotState.STOP
+        ):
+            clear_alarm_tries += 1
+            await self.clear_alarm()
+            await asyncio.sleep(0.2)
+
+        if await self.state != BaseEC.RobotState.STOP:
+            self.logger.error("Alarm cannot be cleared, please check robot state")
+            return False
+
+        self.logger.debug("Alarm cleared successfully")
+        await asyncio.sleep(0.2)
+
+        motor_status_tries = 0
+        while motor_status_tries < max_retries and not await self.sync_status:
+            motor_status_tries += 1
+            await self.sync()
+            await asyncio.sleep(2)
+
+        if not await self.sync_status:
+            self.logger.error("MotorStatus sync failed")
+            return False
+
+        self.logger.debug("MotorStatus synchronized successfully")
+        await asyncio.sleep(0.2)
+
+        servo_on_tries = 0
+        while servo_on_tries < max_retries and not await self.servo_status:
+            servo_on_tries += 1
+            await self.set_servo_status()
+            await asyncio.sleep(0.02)
+
+        if not await self.servo_status:
+            self.logger.error("Servo status set failed")
+            return False
+
+        self.logger.debug("Servo status set successfully")
+        return True
+
+    # ECServo
+    @property
+    async def mode(self) -> BaseEC.RobotMode:  # type: ignore[override]
+        return self.RobotMode((await self.send_CMD("getRobotMode")).result)
+
+    @property
+    async def state(self) -> BaseEC.RobotState:  # type: ignore[override]
+        try:
+            return self.RobotState((await self.send_CMD("getRobotState")).result)
+        except ValueError:
+            return self.RobotState.ERROR
+
+    # ECInfo
+    @property
+    async def servo_version(self) -> str:  # type: ignore[override]
+        rets = await self.send_many(
+            [("getJointVersion", {"axis": i}) for i in range(6)]
+        )
+        return "".join(
+            f"Axis {i + 1} servo version: {ret.result}\n" for i, ret in enumerate(rets)
+        )
+
+    async def get_servo_precise_position_status(  # type: ignore[override]
+        self, is_block: bool = False
+    ) -> CmdResponse:
+        self.logger.info("Querying the exact state of the encoder...")
+        if is_block:
+            while True:
+                ret = await self.send_CMD("get_servo_precise_position_status")
+                if ret.result == 1:
+                    self.logger.info("The robot's servo status is precise")
+                    break
+                await asyncio.sleep(0.002)
+        return await self.send_CMD("get_servo_precise_position_status")
+
+    @ECInfo.current_frame.getter
+    async def current_frame(self) -> BaseEC.Frame:  # type: ignore[override]
+        return self.Frame((await self.send_CMD("getCurrentCoord")).result)
+
+    @ECInfo.cycle_mode.getter
+    async def cycle_mode(self) -> BaseEC.CycleMode:  # type: ignore[override]
+        return self.CycleMode((await self.send_CMD("getCycleMode")).result)
+
+    @ECInfo.tool_frame_num_in_teach_mode.getter
+    async def tool_frame_num_in_teach_mode(  # type: ignore[override]
+        self,
+    ) -> BaseEC.ToolNumber:
+        return self.ToolNumber((await self.send_CMD("getToolNumber")).result)
+
+    @ECInfo.tool_frame_num_in_run_mode.getter
+    async def tool_frame_num_in_run_mode(  # type: ignore[override]
+        self,
+    ) -> BaseEC.ToolNumber:
+        return self.ToolNumber((await self.send_CMD("getAutoRunToolNumber")).result)
+
+    @ECInfo.user_frame_num.getter
+    async def user_frame_num(self) -> BaseEC.UserFrameNumber:  # type: ignore[override]
+        return self.UserFrameNumber((await self.send_CMD("getUserNumber")).result)
+
+    async def get_payload(self, tool_num: int) -> list:  # type: ignore[override]
+        payload = (
+            await self.send_CMD("get_tool_payload", {"tool_num": tool_num})
+        ).result
+        return [payload["m"], payload["tool_cog"]]
+
+    @property
+    async def robot_type(self) -> BaseEC.RobotType:  # type: ignore[override]
+        return self.RobotType((await self.send_CMD("getRobotSubtype")).result)
+
+    @property
+    async def DH_parameters(self) -> List[CmdResponse]:  # type: ignore[override]
+        return await self.send_many([("getDH", {"index": i}) for i in range(11)])
+
+    async def get_md5_password(self, remote_pwd: str) -> str:  # type: ignore[override]
+        word = hashlib.md5()
+        pwd1 = (await self.remote_sys_password).result
+        word.update(pwd1.encode("utf-8"))
+        word.update(remote_pwd.encode("utf-8"))
+        return word.hexdigest()
+
+    async def get_safety_parameters(self) -> list:  # type: ignore[override]
+        cmds = (
+            "getRobotSafetyParamsEnabled",
+            "getRobotSafeyPower",
+            "getRobotSafetyMomentum",
+            "getRobotSafetyToolForce",
+            "getRobotSafetyElbowForce",
+            "getRobotSpeedPercentage",
+        )
+        return await self.send_many([(cmd, None) for cmd in cmds])
+
+    async def get_drag_info(  # type: ignore[override]
+        self, mode: Optional[int] = None
+    ) -> Optional[Union[List[CmdResponse], CmdResponse]]:
+        if mode == 0 or mode is None:
+            return await self.send_many(
+                [
+                    ("getRobotDragStartupMaxSpeed", None),
+                    ("getRobotTorqueErrorMaxPercents", None),
+                ]
+            )
+        return await _resolve(super().get_drag_info(mode))
+
+    @ECInfo.blue_tool_btn_func.getter
+    async def blue_tool_btn_func(self) -> BaseEC.ToolBtnFunc:  # type: ignore[override]
+        ret = await self.send_CMD(
+            "checkFlangeButton", {"button_num": self.ToolBtn.BLUE_BTN.value}
+        )
+        return self.ToolBtnFunc(ret.result)
+
+    @ECInfo.green_tool_btn_func.getter
+    async def green_tool_btn_func(self) -> BaseEC.ToolBtnFunc:  # type: ignore[override]
+        ret = await self.send_CMD(
+            "checkFlangeButton", {"button_num": self.ToolBtn.GREEN_BTN.value}
+        )
+        return self.ToolBtnFunc(ret.result)
+
+    # ECMove
+    async def get_jbi_state(self, file_name: str) -> BaseEC.JbiRunState:  # type: ignore[override]
+        ret = await self.send_CMD("getJbiState", {"filename": file_name})
+        return self.JbiRunState(ret.result["runState"])
+
+    async def move_joint(  # type: ignore[override]
+        self,
+        *args,
+        block: Optional[bool] = True,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> CmdResponse:
+        move_ret = await super().move_joint(*args, block=False, **kwargs)
+        if block and move_ret.success:
+            await self.wait_stop(timeout)
+        return move_ret
+
+    async def move_line(  # type: ignore[override]
+        self,
+        *args,
+        block: Optional[bool] = True,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> CmdResponse:
+        move_ret = await super().move_line(*args, block=False, **kwargs)
+        if block and move_ret.success:
+            await self.wait_stop(timeout)
+        return move_ret
+
+    async def move_arc(  # type: ignore[override]
+        self,
+        *args,
+        block: Optional[bool] = True,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> CmdResponse:
+        move_ret = await super().move_arc(*args, block=False, **kwargs)
+        if block and move_ret.success:
+            await self.wait_stop(timeout)
+        return move_ret
+
+    # ECMoveTT
+    async def TT_init(  # type: ignore[override]
+        self,
+        t: int = 10,
+        lookahead: int = 400,
+        smoothness: float = 0.1,
+        response_enable: Optional[int] = None,
+    ) -> CmdResponse:
+        if await self.TT_state:
+            self.logger.debug("TT state is enabled, automatically clearing TT cache")
+            await asyncio.sleep(0.5)
+            if await self.TT_clear_buff():
+                self.logger.debug("TT cache cleared, initializing TT")
+        self.logger.debug("Initializing TT")
+
+        params = {"lookahead": lookahead, "t": t, "smoothness": smoothness}
+        self.TT_ret_flag = 1
+        if response_enable is not None:
+            self.TT_ret_flag = response_enable
+            params["response_enable"] = response_enable
+        return await self.send_CMD("transparent_transmission_init", params)
+
+    @property
+    async def TT_state(self) -> int:  # type: ignore[override]
+        return (await self.send_CMD("get_transparent_transmission_state")).result
+
+    # ECMoveML
+    async def ml_check_push_result(self) -> BaseEC.MlPushResult:  # type: ignore[override]
+        return self.MlPushResult((await self.send_CMD("check_trajectory")).result)
+
+    # ECVar / ECIO, validation errors return None instead of a future
+    async def get_var(  # type: ignore[override]
+        self, address: str, auto_print: bool = False
+    ) -> Optional[CmdResponse]:
+        var = await _resolve(super().get_var(address))
+        if auto_print and var is not None:
+            print(f"{address}: {var.result}")
+        return var
+
+    async def set_var(  # type: ignore[override]
+        self, address: str, value: Union[int, list]
+    ) -> Optional[CmdResponse]:
+        return await _resolve(super().set_var(address, value))
+
+    async def var_p_is_opened(self, address: int) -> Optional[CmdResponse]:  # type: ignore[override]
+        return await _resolve(super().var_p_is_opened(address))
+
+    async def get_digital_io(  # type: ignore[override]
+        self, address: str, auto_print: bool = False
+    ) -> Optional[CmdResponse]:
+        var = await _resolve(super().get_digital_io(address))
+        if auto_print and var is not None:
+            print(f"{address}: {var.result}")
+        return var
+
+    async def set_digital_io(  # type: ignore[override]
+        self, address: str, value: int
+    ) -> Optional[CmdResponse]:
+        return await _resolve(super().set_digital_io(address, value))
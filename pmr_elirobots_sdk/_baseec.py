@@ -6,25 +6,138 @@ LastEditTime: 2022-09-07 16:47:46
 Description:
 """
 
-import json
+import contextlib
+import dataclasses
+import itertools
+import select
 import socket
 import sys
 import threading
 import time
 from enum import IntEnum
-from typing import Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 # from loguru._logger import Core, Logger
 from loguru import logger
 
-from pmr_elirobots_sdk.types import CmdResponse
+from pmr_elirobots_sdk._codec import DEFAULT_CODEC, JsonCodec
+from pmr_elirobots_sdk._framing import FrameReader
+from pmr_elirobots_sdk._metrics import CmdMetrics
+from pmr_elirobots_sdk._template import CmdTemplate
+from pmr_elirobots_sdk.exceptions import CommandNotRetriedError, ECConnectionError
+from pmr_elirobots_sdk.types import CmdResponse, DrainStats, RetryPolicy
 
+T = TypeVar("T")
+
+
+class PendingCmd:
+    """Command sent to port 8055 whose reply has not been collected yet
+
+    Returned by `BaseEC.submit_CMD`. Several commands can be in flight on the
+    same connection, each reply is routed back to its command by JSON-RPC id.
+    """
+
+    __slots__ = ("_ec", "cmd", "id", "reply", "error", "decode_ns")
+
+    def __init__(self, ec: "BaseEC", cmd: str, id: int) -> None:
+        self._ec = ec
+        self.cmd = cmd
+        self.id = id
+        self.reply: Optional[dict] = None
+        self.error: Optional[Exception] = None
+        self.decode_ns = 0  # Time spent parsing the reply frame, with metrics enabled
+
+    @property
+    def done(self) -> bool:
+        """Whether the reply has already been received or the connection dropped"""
+        return self.reply is not None or self.error is not None
+
+    def wait(self) -> CmdResponse:
+        """Block until the reply for this command arrives
+
+        Returns
+        -------
+            CmdResponse: Corresponding command return information or error message
+
+        Raises
+        ------
+            ConnectionError: The connection dropped before the reply arrived
+        """
+        return self._ec._collect_reply(self)
+
+
+class CmdBatch:
+    """Commands queued by `BaseEC.batch`, sent in a single write when flushed"""
+
+    def __init__(self, ec: "BaseEC") -> None:
+        self._ec = ec
+        self._frames: List[bytes] = []
+        self.pending: List[PendingCmd] = []
+
+    def __enter__(self) -> "CmdBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def send_CMD(self, cmd: str, params: Optional[dict] = None) -> PendingCmd:
+        """Queue a command, its reply is available once the batch is flushed
+
+        Args
+        ----
+            cmd (str): Command
+            params (Dict[str,Any], optional): Parameters. Defaults to None.
+
+        Returns
+        -------
+            PendingCmd: Handle whose `wait()` returns the command CmdResponse
+        """
+        id = next(self._ec._cmd_ids)
+        self._frames.append(self._ec._encode_request(cmd, params, id))
+        pending = PendingCmd(self._ec, cmd, id)
+        self.pending.append(pending)
+        return pending
+
+    def flush(self) -> None:
+        """Send every queued command in a single write"""
+        if not self._frames:
+            return
+        frames, self._frames = self._frames, []
+        self._ec._send_pending(self.pending[-len(frames) :], b"".join(frames))
 
-class BaseEC:
-    _communicate_lock = threading.Lock()
 
+class BaseEC:
     send_recv_info_print = False
 
+    # False when a single thread owns the instance, port 8055 is then used without locking
+    thread_safe = True
+
+    retry_policy = RetryPolicy()
+
+    # JSON functions used on port 8055, orjson when installed
+    codec: JsonCodec = DEFAULT_CODEC
+
+    # Per-method latency histograms, None disables the instrumentation
+    metrics: Optional[CmdMetrics] = None
+
+    def __init__(self) -> None:
+        self.sock_cmd: Optional[socket.socket] = None
+        self._cmd_generation = 0  # Incremented on every new 8055 connection
+        self._cmd_lost = False  # Connection dropped, not closed by the caller
+        self._reconnect_lock = threading.Lock()
+        self._drain_stats = DrainStats()
+
     def _log_init(self, ip, enable_log):
         def _filter(record):
             """Filter display based on log_name when multiple stderr outputs exist"""
@@ -118,41 +231,162 @@ class BaseEC:
         -------
             [tuple]: (True/False, socket/None), returned socket is globally defined in this module
         """
-        self.sock_cmd = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-        # -------------------------------------------------------------------------------
-        # Set nodelay
-        # self.sock.setsockopt(socket.SOL_TCP, socket.TCP_NODELAY, 1)   # Set nodelay
-        # self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
-        # sock.settimeout(timeout)
-        # -------------------------------------------------------------------------------
-
-        try:
-            self.sock_cmd.settimeout(5)
-            self.sock_cmd.connect((ip, port))
+        policy = self.retry_policy
+        self._cmd_address = (ip, port, timeout)
+
+        for attempt in range(policy.max_attempts):
+            if attempt:
+                time.sleep(policy.backoff(attempt - 1))
+
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+            # Nagle would hold every request sent while another one is still
+            # unacknowledged, stalling pipelined and batched commands ~40 ms
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            try:
+                sock.settimeout(5)
+                sock.connect((ip, port))
+            except OSError as e:
+                sock.close()
+                self.logger.warning(
+                    f"{ip} connect attempt {attempt + 1}/{policy.max_attempts} fail: {e}"
+                )
+                continue
+
+            self._reply_channel_init(sock)
+            self._cmd_lost = False
             self.logger.debug(ip + " connect success")
             self.connect_state = True
             return (True, self.sock_cmd)
-        except Exception:
-            self.sock_cmd.close()
-            self.logger.critical(ip + " connect fail")
-            quit()
-            return (False, None)
+
+        self.logger.critical(ip + " connect fail")
+        return (False, None)
 
     def disconnect_ETController(self) -> None:
         """Disconnect EC robot port 8055"""
+        self._cmd_lost = False
         if self.sock_cmd:
-            self.sock_cmd.close()
-            self.sock_cmd = None
+            self._close_cmd_channel(ConnectionError("Disconnected from the controller"))
         else:
             self.sock_cmd = None
             self.logger.critical("socket already closed")
 
+    def _close_cmd_channel(self, error: Exception) -> None:
+        """Close the 8055 socket, failing every command still waiting for a reply"""
+        with self._reply_cond:
+            pending_cmds, self._pending_cmds = self._pending_cmds, {}
+            for pending in pending_cmds.values():
+                pending.error = error
+            self._reply_cond.notify_all()
+
+        with contextlib.suppress(OSError):
+            # Wakes up a thread blocked receiving on the socket
+            self.sock_cmd.shutdown(socket.SHUT_RDWR)
+        self.sock_cmd.close()
+        self.sock_cmd = None
+
+    def _reconnect(self, generation: int) -> None:
+        """Replace a broken 8055 connection, unless another thread already did
+
+        Raises
+        ------
+            ECConnectionError: The controller is still unreachable after all attempts
+        """
+        with self._reconnect_lock:
+            if generation != self._cmd_generation:
+                return
+
+            ip, port, timeout = self._cmd_address
+            self._cmd_lost = True
+            if self.sock_cmd is not None:
+                self._close_cmd_channel(ConnectionError("Connection to controller lost"))
+
+            start = time.perf_counter()
+            if not self.connect_ETController(ip, port, timeout)[0]:
+                raise ECConnectionError(f"{ip}:{port} unreachable, reconnection failed")
+            self.logger.info(
+                f"Reconnected in {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+
+    def _wait_reconnect(self) -> bool:
+        """Wait for a reconnection another thread may be running
+
+        Returns
+        -------
+            bool: True once connected, False when the caller closed the connection
+
+        Raises
+        ------
+            ECConnectionError: The connection was lost and could not be recovered
+        """
+        with self._reconnect_lock:
+            if self.sock_cmd is not None:
+                return True
+        if self._cmd_lost:
+            raise ECConnectionError("Connection to port 8055 lost, reconnection failed")
+        return False
+
+    def _cmd_socket(self) -> socket.socket:
+        """8055 socket to send on, replaced by a reconnection in progress"""
+        sock = self.sock_cmd
+        if sock is None and self._wait_reconnect():
+            sock = self.sock_cmd
+        if sock is None:
+            raise ECConnectionError("Disconnected from port 8055")
+        return sock
+
+    def _call_with_recovery(self, cmds: Sequence[str], call: Callable[[], T]) -> T:
+        """Run `call`, reconnecting port 8055 when the connection drops
+
+        The call is repeated on the new connection when all its commands are
+        idempotent, otherwise CommandNotRetriedError is raised since the
+        controller may already have executed them.
+        """
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            generation = self._cmd_generation
+            try:
+                return call()
+            except ECConnectionError:
+                raise
+            except OSError as e:
+                self.logger.warning(f"CMD: {cmds[0]} | Connection lost: {e}")
+                self._reconnect(generation)
+
+                retry = policy.retry_idempotent and all(
+                    policy.is_idempotent(cmd) for cmd in cmds
+                )
+                if not retry:
+                    raise CommandNotRetriedError(cmds[0]) from e
+
+                attempt += 1
+                if attempt >= policy.max_attempts:
+                    raise ECConnectionError(
+                        f"CMD: {cmds[0]} | Still failing after {attempt} retries"
+                    ) from e
+
+    def _reply_channel_init(self, sock: socket.socket) -> None:
+        """Reset the request id sequence, locks and reply routing of a new 8055 connection"""
+        self._cmd_generation += 1
+        self._communicate_lock = (
+            threading.Lock() if self.thread_safe else contextlib.nullcontext()
+        )
+        self._cmd_ids = itertools.count(1)
+        self._pending_cmds: Dict[int, PendingCmd] = {}
+        self._reply_cond = threading.Condition()
+        self._reply_reader_busy = False
+        self._cmd_reader = FrameReader(sock)
+        self._drainer: Optional[threading.Thread] = None
+        # Published last, a concurrent sender must not see the previous channel
+        self.sock_cmd = sock
+
     def send_CMD(
         self,
         cmd: str,
         params: Optional[dict] = None,
-        id: int = 1,
+        id: Optional[int] = None,
         ret_flag: bool = True,
     ) -> CmdResponse:
         """Send specified command to port 8055
@@ -161,60 +395,510 @@ class BaseEC:
         ----
             cmd (str): Command
             params (Dict[str,Any], optional): Parameters. Defaults to None.
-            id (int, optional): ID number. Defaults to 1.
+            id (int, optional): Ignored, every request gets a unique id. Defaults to None.
             ret_flag (bool, optional): Whether to receive data after sending. Defaults to True.
 
         Returns
         -------
             Any: Corresponding command return information or error message
+
+        Raises
+        ------
+            CommandNotRetriedError: Connection dropped during a non idempotent command
+            ECConnectionError: Connection lost and the controller is unreachable
         """
 
-        if not self.alive:
+        if not self.alive and not self._wait_reconnect():
             self.logger.error("Socket invalid, connection is broken")
             return CmdResponse(False, "", "")
 
+        def call() -> CmdResponse:
+            if self.metrics is not None:
+                return self._measured_call(
+                    cmd, self._send_request, cmd, params, ret_flag
+                )
+            pending = self._send_request(cmd, params, ret_flag)
+            if pending is None:
+                return CmdResponse(True, "", "")
+            return self._collect_reply(pending)
+
+        return self._call_with_recovery((cmd,), call)
+
+    def send_compiled_CMD(
+        self, template: CmdTemplate, *values: Any, ret_flag: bool = True
+    ) -> CmdResponse:
+        """Send a command rendered from a precompiled template to port 8055
+
+        Args
+        ----
+            template (CmdTemplate): Pre-encoded command
+            *values: Numbers or sequences of numbers, one per template slot
+            ret_flag (bool, optional): Whether to receive data after sending. Defaults to True.
+
+        Returns
+        -------
+            CmdResponse: Corresponding command return information or error message
+        """
+        if not self.alive and not self._wait_reconnect():
+            self.logger.error("Socket invalid, connection is broken")
+            return CmdResponse(False, "", "")
+
+        cmd = template.cmd
+
+        def call() -> CmdResponse:
+            if self.metrics is not None:
+                return self._measured_call(
+                    cmd, self._send_compiled, template, values, ret_flag
+                )
+            pending = self._send_compiled(template, values, ret_flag)
+            if pending is None:
+                return CmdResponse(True, "", "")
+            return self._collect_reply(pending)
+
+        return self._call_with_recovery((cmd,), call)
+
+    def _wait_stop(self, timeout: Optional[float] = None) -> bool:
+        """Block until the robot leaves the PLAY state
+
+        Woken by the monitor thread when it is running, otherwise polls
+        getRobotState on port 8055 every 5 ms.
+
+        Args
+        ----
+            timeout (float, optional): Maximum wait in seconds. Defaults to None, no limit.
+
+        Returns
+        -------
+            bool: True once the robot stopped, False if it still runs after `timeout`
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        result = self._monitor_wait_stop(deadline)
+        while result is None:
+            time.sleep(0.005)
+            result = self.send_CMD("getRobotState").result
+            if result == self.RobotState.PLAY and (
+                deadline is None or time.monotonic() < deadline
+            ):
+                result = None
+
+        if result == self.RobotState.PLAY:
+            self.logger.warning(f"The robot is still running after {timeout} s")
+            return False
+        try:
+            state = self.RobotState(result)
+        except ValueError:
+            state = self.RobotState.ERROR
+        if state != self.RobotState.STOP:
+            str_ = [
+                "",
+                "Robot is in pause state",
+                "Robot is in emergency stop state",
+                "",
+                "Robot is in error state",
+                "Robot is in collision state",
+            ]
+            self.logger.debug(str_[state.value])
+        self.logger.info("The robot has stopped")
+        return True
+
+    def _monitor_wait_stop(self, deadline: Optional[float]) -> Optional[int]:
+        """Wait on monitor frames for the robot to leave PLAY, overridden by ECMonitor
+
+        Returns
+        -------
+            Optional[int]: robotState, PLAY at the deadline, None when the stream is unavailable
+        """
+        return None
+
+    def _monitor_value(self, field: str) -> Any:
+        """Value of an 8056 field from a fresh monitor frame, overridden by ECMonitor
+
+        Returns
+        -------
+            Any: Field value, None when the getter must query port 8055
+        """
+        return None
+
+    def _monitor_or_send(
+        self, field: str, cmd: str, params: Optional[dict] = None
+    ) -> CmdResponse:
+        """Answer a getter from the monitor stream, or from port 8055 when stale"""
+        value = self._monitor_value(field)
+        if value is None:
+            return self.send_CMD(cmd, params)
+        return CmdResponse(True, value, "")
+
+    def enable_metrics(self) -> CmdMetrics:
+        """Record counts and latency histograms of every `send_CMD` call
+
+        Returns
+        -------
+            CmdMetrics: Recorder whose `snapshot()` returns the metrics per method
+
+        Examples
+        --------
+        >>> metrics = ec.enable_metrics()
+        >>> ec.current_joint
+        >>> print(metrics.snapshot())
+        >>> ec.metrics = None  # Disable
+        """
+        if self.metrics is None:
+            self.metrics = CmdMetrics()
+        return self.metrics
+
+    def _measured_call(
+        self, cmd: str, send: Callable[..., Optional[PendingCmd]], *args: Any
+    ) -> CmdResponse:
+        """Send one request and wait for its reply, recording the time of each step"""
+        metrics = self.metrics
+        assert metrics is not None
+        start = time.perf_counter_ns()
+        try:
+            pending = send(*args)
+            sent = time.perf_counter_ns()
+            if pending is None:
+                metrics.record(cmd, sent - start)
+                return CmdResponse(True, "", "")
+
+            jdata = self._await_reply(pending)
+            received = time.perf_counter_ns()
+            response = self._parse_reply(cmd, jdata)
+            decode_ns = pending.decode_ns + time.perf_counter_ns() - received
+        except Exception:
+            metrics.record(cmd, error=True)
+            raise
+
+        metrics.record(
+            cmd,
+            sent - start,
+            received - sent - pending.decode_ns,
+            decode_ns,
+            not response.success,
+        )
+        return response
+
+    def submit_CMD(
+        self, cmd: str, params: Optional[dict] = None, id: Optional[int] = None
+    ) -> PendingCmd:
+        """Send specified command to port 8055 without waiting for its reply
+
+        Several commands can be submitted back to back, they are answered by the
+        controller in a single round trip instead of one round trip each.
+
+        Args
+        ----
+            cmd (str): Command
+            params (Dict[str,Any], optional): Parameters. Defaults to None.
+            id (int, optional): Ignored, every request gets a unique id. Defaults to None.
+
+        Returns
+        -------
+            PendingCmd: Handle whose `wait()` returns the command CmdResponse
+
+        Examples
+        --------
+        >>> state = ec.submit_CMD("getRobotState")
+        >>> joint = ec.submit_CMD("get_joint_pos")
+        >>> print(state.wait().result, joint.wait().result)
+        """
+        if not self.alive and not self._wait_reconnect():
+            raise ConnectionError("Socket invalid, connection is broken")
+
+        return self._send_request(cmd, params, True)
+
+    def send_many(
+        self, cmds: Iterable[Tuple[str, Optional[dict]]]
+    ) -> List[CmdResponse]:
+        """Send several commands to port 8055 in a single write
+
+        Args
+        ----
+            cmds (Iterable[Tuple[str, Optional[dict]]]): (command, parameters) pairs
+
+        Returns
+        -------
+            List[CmdResponse]: Replies in the same order as the commands
+
+        Raises
+        ------
+            CommandNotRetriedError: Connection dropped and some command is not idempotent
+            ECConnectionError: Connection lost and the controller is unreachable
+
+        Examples
+        --------
+        >>> state, mode = ec.send_many([("getRobotState", None), ("getRobotMode", None)])
+        """
+        if not self.alive and not self._wait_reconnect():
+            self.logger.error("Socket invalid, connection is broken")
+            return [CmdResponse(False, "", "") for _ in cmds]
+
+        cmds = list(cmds)
+
+        def call() -> List[CmdResponse]:
+            with self.batch() as batch:
+                for cmd, params in cmds:
+                    batch.send_CMD(cmd, params)
+            return [pending.wait() for pending in batch.pending]
+
+        return self._call_with_recovery([cmd for cmd, _ in cmds], call)
+
+    def batch(self) -> "CmdBatch":
+        """Queue commands and send them in a single write when the block exits
+
+        Returns
+        -------
+            CmdBatch: Context manager whose `send_CMD` returns a PendingCmd
+
+        Examples
+        --------
+        >>> with ec.batch() as batch:
+        >>>     state = batch.send_CMD("getRobotState")
+        >>>     joint = batch.send_CMD("get_joint_pos")
+        >>> print(state.wait().result, joint.wait().result)
+        """
+        return CmdBatch(self)
+
+    def _send_compiled(
+        self, template: CmdTemplate, values: Sequence[Any], ret_flag: bool
+    ) -> Optional[PendingCmd]:
+        """Write one request rendered from a template to port 8055"""
+        id = next(self._cmd_ids)
+        send_bytes = template.encode(id, *values, codec=self.codec)
+        if self.send_recv_info_print:  # print send msg
+            self.logger.info(f"Send: Func is {template.cmd}")
+            self.logger.info(str(send_bytes, "utf-8"))
+        return self._send_encoded(template.cmd, id, send_bytes, ret_flag)
+
+    def _send_request(
+        self, cmd: str, params: Optional[dict], ret_flag: bool
+    ) -> Optional[PendingCmd]:
+        """Write one request to port 8055, registering it for reply routing
+
+        Ids always come from the connection sequence, a caller supplied id could
+        collide with one still pending and steal its reply.
+        """
+        id = next(self._cmd_ids)
+        send_bytes = self._encode_request(cmd, params, id)
+        return self._send_encoded(cmd, id, send_bytes, ret_flag)
+
+    def _send_encoded(
+        self, cmd: str, id: int, send_bytes: bytes, ret_flag: bool
+    ) -> Optional[PendingCmd]:
+        """Write one already encoded request to port 8055"""
+        if not ret_flag:
+            sock = self._cmd_socket()
+            with self._communicate_lock:
+                sock.sendall(send_bytes)
+            self._drain_replies(sock)
+            return None
+
+        pending = PendingCmd(self, cmd, id)
+        self._send_pending([pending], send_bytes)
+        return pending
+
+    def _send_pending(self, pendings: List[PendingCmd], send_bytes: bytes) -> None:
+        """Register commands for reply routing, then write their encoded requests"""
+        # Registered before sending, the reply may be read by another thread
+        for pending in pendings:
+            self._pending_cmds[pending.id] = pending
+
+        try:
+            sock = self._cmd_socket()
+            with self._communicate_lock:
+                sock.sendall(send_bytes)
+        except Exception:
+            for pending in pendings:
+                self._pending_cmds.pop(pending.id, None)
+            raise
+
+    def _drain_replies(self, sock: socket.socket) -> None:
+        """Keep replies to fire-and-forget commands from piling up in the socket
+
+        The controller may still answer commands sent with `ret_flag=False`.
+        Unread, those replies fill the receive buffer until the controller stalls,
+        so a background thread reads them whenever no caller is waiting for a
+        reply. Without locking, ready replies are read right after the send.
+        """
+        if not self.thread_safe:
+            reader = self._cmd_reader
+            while select.select([sock], [], [], 0)[0]:
+                reader.fill()
+                self._dispatch_ready_frames()
+            return
+
+        if self._drainer is not None:
+            return
+        with self._reply_cond:
+            if self._drainer is not None:
+                return
+            self._drainer = threading.Thread(
+                target=self._drain_loop,
+                args=(self._cmd_generation, sock),
+                name=f"ec-drain-{self.robot_ip}",
+                daemon=True,
+            )
+        self._drainer.start()
+
+    def _drain_loop(self, generation: int, sock: socket.socket) -> None:
+        """Read replies nobody waits for until the connection is replaced or closed"""
+        cond = self._reply_cond
+        reader = self._cmd_reader
+        while generation == self._cmd_generation:
+            try:
+                if not select.select([sock], [], [], 0.5)[0]:
+                    continue
+            except (OSError, ValueError):
+                return  # Socket closed
+
+            with cond:
+                if self._reply_reader_busy:
+                    # The caller reading the socket dispatches these replies too
+                    cond.wait(0.5)
+                    continue
+                self._reply_reader_busy = True
+
+            try:
+                # Data may have been read by a caller before the reader was free
+                if select.select([sock], [], [], 0)[0]:
+                    reader.fill()
+            except (OSError, ValueError) as e:
+                if generation == self._cmd_generation:
+                    self.logger.warning(f"8055 drainer stopped | Exception: {e}")
+                return
+            finally:
+                with cond:
+                    self._reply_reader_busy = False
+                    if generation == self._cmd_generation:
+                        self._dispatch_ready_frames()
+                    cond.notify_all()
+
+    def _dispatch_ready_frames(self) -> None:
+        """Route every complete reply already in the receive buffer"""
+        reader = self._cmd_reader
+        while True:
+            frame = reader.next_frame()
+            if frame is None:
+                return
+            self._dispatch_reply(frame)
+
+    @property
+    def drain_stats(self) -> DrainStats:
+        """Counts of port 8055 replies that no command was waiting for"""
+        return dataclasses.replace(self._drain_stats)
+
+    def _encode_request(self, cmd: str, params: Optional[dict], id: int) -> bytes:
+        """Serialize one JSON-RPC request frame"""
         parsed_params = params if params else {}
-        sendStr = json.dumps(
+        send_bytes = self.codec.dumps(
             {"jsonrpc": "2.0", "method": cmd, "params": parsed_params, "id": id}
         )
-        sendStr += "\n"
 
         if self.send_recv_info_print:  # print send msg
             self.logger.info(f"Send: Func is {cmd}")
-            self.logger.info(sendStr)
+            self.logger.info(str(send_bytes, "utf-8"))
 
-        try:
-            with BaseEC._communicate_lock:
-                self.sock_cmd.sendall(bytes(sendStr, "utf-8"))
+        return send_bytes + b"\n"
 
-                if not ret_flag:
-                    return CmdResponse(True, "", "")
+    def _collect_reply(self, pending: PendingCmd) -> CmdResponse:
+        """Wait for the reply of a pending command and parse it"""
+        return self._parse_reply(pending.cmd, self._await_reply(pending))
 
-                ret = self.sock_cmd.recv(1024)
-                jdata = json.loads(str(ret, "utf-8"))
+    def _await_reply(self, pending: PendingCmd) -> dict:
+        """Wait for the decoded reply of a pending command
 
-                if self.send_recv_info_print:  # print recv nsg
-                    self.logger.info(f"Recv: Func is {cmd}")
-                    self.logger.info(str(ret, "utf-8"))
-
-                if "result" in jdata:
-                    if jdata["id"] != id:
-                        self.logger.warning(
-                            "id match fail,send_id={0},recv_id={0}", id, jdata["id"]
-                        )
-                    return CmdResponse(True, json.loads(jdata["result"]), jdata["id"])
+        Only one thread reads the socket at a time. Every reply it reads is
+        handed to the command with the same id, then the waiting threads are
+        woken up and one of the still unanswered ones takes over the reading.
+        """
+        if not self.thread_safe:
+            try:
+                while not pending.done:
+                    self._dispatch_reply(self._cmd_reader.read_frame())
+            except Exception:
+                self._pending_cmds.pop(pending.id, None)
+                raise
+            return pending.reply
+
+        cond = self._reply_cond
+        with cond:
+            while not pending.done:
+                if self._reply_reader_busy:
+                    cond.wait()
+                    continue
+
+                self._reply_reader_busy = True
+                cond.release()
+                try:
+                    frame = self._cmd_reader.read_frame()
+                except Exception:
+                    self._pending_cmds.pop(pending.id, None)
+                    raise
+                finally:
+                    cond.acquire()
+                    self._reply_reader_busy = False
+                    cond.notify_all()
+
+                self._dispatch_reply(frame)
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.reply
+
+    def _dispatch_reply(self, frame: bytes) -> None:
+        """Route a received reply to the pending command with the same id"""
+        if self.metrics is None:
+            matched = self._match_reply(frame)
+            if matched is not None:
+                pending, jdata = matched
+                pending.reply = jdata
+            return
 
-                if "error" in jdata:
-                    self.logger.warning(f"CMD: {cmd} | {jdata['error']['message']}")
-                    return CmdResponse(False, jdata["error"]["message"], jdata["id"])
+        start = time.perf_counter_ns()
+        matched = self._match_reply(frame)
+        if matched is not None:
+            pending, jdata = matched
+            pending.decode_ns = time.perf_counter_ns() - start
+            pending.reply = jdata
 
-                self.logger.error("Received package didn't match any known structure")
-                return CmdResponse(False, "", "")
+    def _match_reply(self, frame: bytes) -> Optional[Tuple[Any, dict]]:
+        """Decode a reply frame and pop the pending command it answers
 
-        except Exception as e:
-            self.logger.error(f"CMD: {cmd} | Exception: {e}")
-            quit()
-            return (False, None, None)
+        Returns
+        -------
+            Optional[Tuple[Any, dict]]: (pending command, reply), None if no command waits for it
+        """
+        jdata = self.codec.loads(frame)
+        id = jdata.get("id")
+        pending = self._pending_cmds.pop(id, None)
+
+        if pending is None:
+            # Ids are only required to be unique, peeking the sequence is cheaper
+            # than recording the last id issued on every send
+            if isinstance(id, int) and 0 < id < next(self._cmd_ids):
+                self._drain_stats.deferred += 1
+            else:
+                self._drain_stats.unsolicited += 1
+            self.logger.debug(f"Dropped reply without pending command: {frame!r}")
+            return None
+
+        if self.send_recv_info_print:  # print recv nsg
+            self.logger.info(f"Recv: Func is {pending.cmd}")
+            self.logger.info(str(frame, "utf-8"))
+
+        return pending, jdata
+
+    def _parse_reply(self, cmd: str, jdata: dict) -> CmdResponse:
+        """Convert a JSON-RPC reply into a CmdResponse"""
+        if "result" in jdata:
+            result = self.codec.loads_result(jdata["result"])
+            return CmdResponse(True, result, jdata["id"])
+
+        if "error" in jdata:
+            self.logger.warning(f"CMD: {cmd} | {jdata['error']['message']}")
+            return CmdResponse(False, jdata["error"]["message"], jdata["id"])
+
+        self.logger.error("Received package didn't match any known structure")
+        return CmdResponse(False, "", "")
 
     @property
     def alive(self):
@@ -0,0 +1,125 @@
+"""
+Description: JSON codecs used on port 8055
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, see the "fast" extra
+    orjson = None
+
+_Text = Union[str, bytes, bytearray]
+
+_LITERALS = {"true": True, "false": False, "null": None}
+_COMPOUND_START = frozenset('[{"')
+# Exactly the JSON numbers, float() also accepts "1_000", "inf" or "nan"
+_JSON_INT = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_NUMBERS = frozenset((int, float))  # Exact types, bool and NumPy values excluded
+_SEQUENCES = frozenset((list, tuple))
+
+
+class JsonCodec:
+    """Pair of JSON functions used to encode requests and decode replies
+
+    Args
+    ----
+        name (str): Codec name, for display
+        dumps (Callable[[Any], bytes]): Serializes an object to UTF-8 JSON bytes
+        loads (Callable[[_Text], Any]): Parses JSON text or bytes
+        dumps_value (Callable, optional): Serializes `CmdTemplate` slots, None disables them.
+    """
+
+    __slots__ = ("name", "dumps", "loads", "dumps_value")
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[_Text], Any],
+        dumps_value: Optional[Callable[[Any], bytes]] = None,
+    ) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.dumps_value = dumps_value
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+    def loads_result(self, text: str) -> Any:
+        """Decode the string encoded `result` field of a reply
+
+        Most replies carry a single number or boolean, those are converted
+        directly instead of running a second JSON parse.
+        """
+        if not isinstance(text, str):
+            return text
+        if text[:1] in _COMPOUND_START:
+            return self.loads(text)
+
+        literal = _LITERALS.get(text, _LITERALS)
+        if literal is not _LITERALS:
+            return literal
+
+        if _JSON_INT.fullmatch(text):
+            return int(text)
+        if _JSON_NUMBER.fullmatch(text):
+            return float(text)
+        return self.loads(text)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+def _stdlib_loads(text: _Text) -> Any:
+    # json.loads detects the encoding of bytes first, decoding them here is faster
+    if not isinstance(text, str):
+        text = str(text, "utf-8")
+    return json.loads(text)
+
+
+def _stdlib_dumps_value(value: Any) -> bytes:
+    """JSON of a number or of a sequence of numbers
+
+    `str` renders plain ints and floats as the shortest round-trip text, faster
+    than `json.dumps`. Anything else, such as bools or NumPy values, goes through
+    `json.dumps`, and NaN or infinity raise ValueError as they are not JSON.
+    """
+    if type(value) in _NUMBERS:
+        text = str(value)
+        if "n" not in text:  # nan, inf
+            return text.encode("ascii")
+    elif type(value) in _SEQUENCES and _NUMBERS.issuperset(map(type, value)):
+        text = ",".join(map(str, value))
+        if "n" not in text:
+            return ("[" + text + "]").encode("ascii")
+    text = json.dumps(
+        value, separators=(",", ":"), allow_nan=False, default=_to_builtin
+    )
+    return text.encode("ascii")
+
+
+def _to_builtin(obj: Any) -> Any:
+    """`json.dumps` fallback converting NumPy scalars and arrays"""
+    tolist = getattr(obj, "tolist", None)
+    if tolist is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return tolist()
+
+
+STDLIB_CODEC = JsonCodec("json", _stdlib_dumps, _stdlib_loads, _stdlib_dumps_value)
+
+ORJSON_CODEC: Optional[JsonCodec] = None
+if orjson is not None:
+    ORJSON_CODEC = JsonCodec(
+        "orjson",
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        orjson.loads,
+    )
+
+DEFAULT_CODEC = ORJSON_CODEC or STDLIB_CODEC
@@ -13,6 +13,7 @@ from pmr_elirobots_sdk._profinet import ECProfinet as __ECProfinet
 from pmr_elirobots_sdk._servo import ECServo as __ECServo
 from pmr_elirobots_sdk._var import ECIO as __ECIO
 from pmr_elirobots_sdk._var import ECVar as __ECVar
+from pmr_elirobots_sdk.types import RetryPolicy
 
 __recommended_min_robot_version = "3.0.0"
 # All interfaces were tested in v3.0.0. Most interfaces can also run in versions lower than this, but they have not been tested
@@ -38,6 +39,8 @@ class _EC(
         name: Optional[str] = "None",
         auto_connect: bool = False,
         enable_log: bool = True,
+        thread_safe: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> None:
         """Initialize EC robot
 
@@ -47,12 +50,17 @@ class _EC(
             name (Optional[str], optional): Robot name, visible when printing the instance. Defaults to "None".
             auto_connect (bool, optional): Whether to automatically connect to the robot. Defaults to False.
             enable_log (bool, optional): Whether to log events in stdout. Defaults to True.
+            thread_safe (bool, optional): False skips the 8055 locks. Defaults to True.
+            retry_policy (RetryPolicy, optional): 8055 reconnection. Defaults to RetryPolicy().
         """
         super().__init__()
         self.robot_ip = ip
         self.robot_name = name
         self.connect_state = False
         self.enable_log = enable_log
+        self.thread_safe = thread_safe
+        if retry_policy is not None:
+            self.retry_policy = retry_policy
         self._log_init(self.robot_ip, self.enable_log)
 
         if auto_connect:
@@ -64,25 +72,21 @@ class _EC(
         else:
             return f"Elite EC6__, IP: {self.robot_ip}, Name: {self.robot_name}"
 
-    def wait_stop(self) -> None:
-        """Wait for the robot motion to stop"""
-        while True:
-            time.sleep(0.005)
-            result = self.state
-            if result != self.RobotState.PLAY:
-                if result != self.RobotState.STOP:
-                    str_ = [
-                        "",
-                        "Robot is in pause state",
-                        "Robot is in emergency stop state",
-                        "",
-                        "Robot is in error state",
-                        "Robot is in collision state",
-                    ]
-                    self.logger.debug(str_[result.value])
-                    break
-                break
-        self.logger.info("The robot has stopped")
+    def wait_stop(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the robot motion to stop
+
+        While `monitor_thread_run` is active, the stop is detected from the 8056
+        frames within one frame period and nothing is sent to port 8055.
+
+        Args
+        ----
+            timeout (float, optional): Maximum wait in seconds. Defaults to None, no limit.
+
+        Returns
+        -------
+            bool: True once the robot stopped, False if it still runs after `timeout`
+        """
+        return self._wait_stop(timeout)
 
     # Custom method implementation
     def robot_servo_on(self, max_retries: int = 5) -> bool:
@@ -0,0 +1,276 @@
+"""
+Description: 8056 monitoring of many robots on a single thread
+"""
+
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from pmr_elirobots_sdk._monitor import ECMonitor, ECMonitorInfo, _MonitorStream
+
+
+class MonitorFleet:
+    """Receive the 8056 streams of many robots with one selector thread
+
+    Replaces one `monitor_thread_run` thread per robot. Every socket is
+    non-blocking and registered in a single selector (epoll on Linux), frames
+    are decoded as soon as they are complete and published on their robot
+    exactly as `monitor_run` does: `monitor_info`, `monitor_record`, history,
+    recording, statistics and `wait_stop` all work unchanged.
+
+    First connections and reconnections are non-blocking connects too, a robot
+    that cannot be reached is stopped without holding up the others.
+
+    Args
+    ----
+        robots (Iterable[ECMonitor]): Robots to monitor, usually `EC` instances
+
+    Examples
+    --------
+    >>> robots = [EC(ip=f"192.168.1.{200 + i}") for i in range(20)]
+    >>> with MonitorFleet(robots) as fleet:
+    >>>     while True:
+    >>>         for ip, info in fleet.snapshot().items():
+    >>>             print(ip, info.robotState)
+    >>>         time.sleep(1)
+    """
+
+    _SELECT_TIMEOUT = 0.1  # Seconds between checks of `stop`
+    _CONNECT_TIMEOUT = 5.0  # Seconds for a connection, as in `monitor_run`
+
+    def __init__(self, robots: Iterable[ECMonitor]) -> None:
+        self.robots = list(robots)
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+        self._connecting: Dict[socket.socket, float] = {}  # Socket, deadline
+        self._sizes: Dict[socket.socket, bytearray] = {}  # Probe, MessageSize bytes
+        self._opening: Set[Any] = set()  # Robots whose stream never connected yet
+
+    def __enter__(self) -> "MonitorFleet":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> "MonitorFleet":
+        """Run the selector loop in a background thread
+
+        Returns
+        -------
+            MonitorFleet: self
+        """
+        self.running = True
+        self._thread = threading.Thread(
+            target=self.run, daemon=True, name="Elibot monitor fleet"
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the loop and close every 8056 connection"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, ECMonitorInfo]:
+        """Last frame of every robot, keyed by IP
+
+        Returns
+        -------
+            Dict[str, ECMonitorInfo]: Published frames, never modified afterwards
+        """
+        return {
+            ec.robot_ip: ec.monitor_info  # type: ignore[attr-defined]
+            for ec in self.robots
+        }
+
+    def run(self) -> None:
+        """Receive frames until `stop` is called, blocking the calling thread"""
+        self.running = True
+        selector = selectors.DefaultSelector()
+        try:
+            for ec in self.robots:
+                try:
+                    ec._monitor_begin()
+                except OSError as e:
+                    ec.logger.error(f"8056 connection failed | Exception: {e}")
+                    self._close(ec)
+                    continue
+                self._opening.add(ec)
+                # Like `monitor_run`, a first connection only reads the frame size
+                self._connect(selector, ec, None)
+
+            while self.running and selector.get_map():
+                for key, _ in selector.select(self._SELECT_TIMEOUT):
+                    ec, stream = key.data
+                    if key.events & selectors.EVENT_WRITE:
+                        self._connected(selector, key)
+                    elif not ec.monitor_run_state:
+                        self._drop(selector, key.fileobj, ec)
+                    elif stream is None:
+                        self._read_size(selector, key)
+                    elif not self._receive(ec, stream):
+                        selector.unregister(key.fileobj)
+                        self._reconnect(selector, ec, stream)
+                self._expire_connects(selector)
+        finally:
+            for key in list(selector.get_map().values()):
+                ec, _ = key.data
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                ec.monitor_run_state = False
+                ec._monitor_closed()
+            self._connecting.clear()
+            self._sizes.clear()
+            self._opening.clear()
+            selector.close()
+
+    @staticmethod
+    def _close(ec: Any) -> None:
+        """Stop monitoring one robot, the others keep running"""
+        ec.monitor_run_state = False
+        sock = getattr(ec, "sock_monitor", None)
+        if sock is not None:
+            sock.close()
+        ec._monitor_closed()
+
+    def _drop(
+        self,
+        selector: selectors.BaseSelector,
+        sock: socket.socket,
+        ec: Any,
+        error: Optional[str] = None,
+    ) -> None:
+        """Close a registered socket and stop its robot, logging `error` if any"""
+        selector.unregister(sock)
+        sock.close()
+        self._connecting.pop(sock, None)
+        self._sizes.pop(sock, None)
+        self._fail(ec, error)
+
+    def _fail(self, ec: Any, error: Optional[str]) -> None:
+        """Stop a robot whose connection failed, logging `error` if any"""
+        if error is not None:
+            state = "failed" if ec in self._opening else "lost"
+            ec.logger.error(f"8056 connection {state} | Exception: {error}")
+        self._opening.discard(ec)
+        self._close(ec)
+
+    @staticmethod
+    def _receive(ec: Any, stream: _MonitorStream) -> bool:
+        """Read what is available of the current frame, publish it once complete
+
+        Returns
+        -------
+            bool: False when the connection closed or the frame is malformed
+        """
+        view = stream.views[stream.back]
+        try:
+            n = ec.sock_monitor.recv_into(view[stream.received :])
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        if n == 0:
+            return False
+
+        stream.received += n
+        if stream.received < stream.msg_size:
+            return True
+        stream.received = 0
+        ec._recv_buf_size = stream.msg_size
+        ec._tt += 1
+        return stream.publish()
+
+    def _connect(
+        self,
+        selector: selectors.BaseSelector,
+        ec: Any,
+        stream: Optional[_MonitorStream],
+    ) -> None:
+        """Start a connection without blocking the other robots
+
+        Args
+        ----
+            stream (Optional[_MonitorStream]): Frames to receive, None to only read
+                the MessageSize of a first connection
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        if stream is not None:
+            ec.sock_monitor = sock
+        try:
+            sock.connect((ec.robot_ip, ec._PORT))
+        except BlockingIOError:
+            pass  # In progress, the socket turns writable once connected
+        except OSError as e:
+            sock.close()
+            self._fail(ec, str(e))
+            return
+        self._connecting[sock] = time.monotonic() + self._CONNECT_TIMEOUT
+        if stream is None:
+            self._sizes[sock] = bytearray()
+        selector.register(sock, selectors.EVENT_WRITE, (ec, stream))
+
+    def _reconnect(
+        self, selector: selectors.BaseSelector, ec: Any, stream: _MonitorStream
+    ) -> None:
+        """Start replacing a dropped connection"""
+        stream.received = 0
+        ec.sock_monitor.close()
+        self._connect(selector, ec, stream)
+
+    def _connected(self, selector: selectors.BaseSelector, key: Any) -> None:
+        """Start reading a connected socket, or stop its robot on failure"""
+        sock, (ec, stream) = key.fileobj, key.data
+        error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error or not ec.monitor_run_state:
+            self._drop(selector, sock, ec, os.strerror(error) if error else None)
+            return
+        selector.modify(sock, selectors.EVENT_READ, key.data)
+        if stream is None:
+            return  # The MessageSize follows, still within the deadline
+        del self._connecting[sock]
+        if ec in self._opening:
+            self._opening.discard(ec)
+        else:
+            ec._monitor_reconnected()
+
+    def _read_size(self, selector: selectors.BaseSelector, key: Any) -> None:
+        """Read the MessageSize of a first connection, then connect the stream"""
+        sock, (ec, _) = key.fileobj, key.data
+        size = self._sizes[sock]
+        missing = struct.calcsize(ec._FMT_MSG_SIZE) - len(size)
+        try:
+            data = sock.recv(missing)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._drop(selector, sock, ec, str(e))
+            return
+        if not data:
+            self._drop(selector, sock, ec, "connection closed")
+            return
+        size += data
+        if len(data) < missing:
+            return
+
+        selector.unregister(sock)
+        sock.close()
+        del self._connecting[sock], self._sizes[sock]
+        ec._monitor_set_size(bytes(size))
+        self._connect(selector, ec, ec._monitor_stream())
+
+    def _expire_connects(self, selector: selectors.BaseSelector) -> None:
+        """Stop the robots whose connection did not complete in time"""
+        now = time.monotonic()
+        for sock, deadline in list(self._connecting.items()):
+            if now < deadline:
+                continue
+            ec, _ = selector.get_key(sock).data
+            self._drop(selector, sock, ec, "connect timed out")
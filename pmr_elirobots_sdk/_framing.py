@@ -0,0 +1,95 @@
+"""
+Description: Newline framed reader for the 8055 JSON-RPC stream
+"""
+
+import socket
+from typing import Optional
+
+
+class FrameReader:
+    """Buffered reader splitting a socket byte stream into newline terminated frames
+
+    Bytes are received straight into a reusable `bytearray`, so responses split
+    across several TCP segments, larger than a single `recv` or coalesced with
+    the next response are all handled. The buffer only grows when one frame does
+    not fit in it, and is reused for every following frame.
+    """
+
+    def __init__(self, sock: socket.socket, bufsize: int = 4096) -> None:
+        self._sock = sock
+        self._buf = bytearray(bufsize)
+        self._view = memoryview(self._buf)
+        self._start = 0  # First byte not yet returned as a frame
+        self._end = 0  # End of the received data
+        self._scan = 0  # Bytes before this position hold no newline
+
+    @property
+    def buffered(self) -> int:
+        """Number of received bytes not returned as a frame yet"""
+        return self._end - self._start
+
+    def fill(self) -> int:
+        """Receive once from the socket into the free space of the buffer
+
+        Returns
+        -------
+            int: Number of bytes received
+
+        Raises
+        ------
+            ConnectionError: The peer closed the connection
+        """
+        if self._start == self._end:
+            self._start = self._end = self._scan = 0
+        elif self._end == len(self._buf):
+            self._make_room()
+
+        n = self._sock.recv_into(self._view[self._end :])
+        if n == 0:
+            raise ConnectionError("Connection closed by the controller")
+        self._end += n
+        return n
+
+    def next_frame(self) -> Optional[bytes]:
+        """Pop the next complete frame already in the buffer
+
+        Returns
+        -------
+            Optional[bytes]: Frame without its trailing newline, None until a frame is complete
+        """
+        idx = self._buf.find(b"\n", self._scan, self._end)
+        if idx < 0:
+            self._scan = self._end
+            return None
+
+        # Copied once, straight from the view, the buffer is reused afterwards
+        frame = bytes(self._view[self._start : idx])
+        self._start = self._scan = idx + 1
+        return frame
+
+    def read_frame(self) -> bytes:
+        """Block until a complete frame is available and return it
+
+        Returns
+        -------
+            bytes: Frame without its trailing newline
+        """
+        while True:
+            frame = self.next_frame()
+            if frame is not None:
+                return frame
+            self.fill()
+
+    def _make_room(self) -> None:
+        """Move the partial frame to the buffer start, growing it when already there"""
+        size = self._end - self._start
+        if self._start > 0:
+            self._buf[:size] = bytes(self._view[self._start : self._end])
+            self._scan -= self._start
+            self._start, self._end = 0, size
+            return
+
+        # memoryview exports must be released before resizing the bytearray
+        self._view.release()
+        self._buf.extend(bytes(len(self._buf)))
+        self._view = memoryview(self._buf)
@@ -0,0 +1,125 @@
+"""
+Description: Fixed capacity history of 8056 monitor frames
+"""
+
+from typing import Any, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, see the "numpy" extra
+    np = None
+
+
+class MonitorHistory:
+    """Preallocated ring of the last `capacity` monitor frames
+
+    Filled by the monitor thread with one copy of the received bytes per frame.
+    Every field is a column of the ring, `history` and `last` return views of
+    it, only ranges wrapping around the end of the ring are copied. Returned
+    views are overwritten once the ring wraps, `.copy()` them to keep them.
+
+    Args
+    ----
+        dtype (numpy.dtype): Structured dtype of the frame, from `ECMonitorInfo.numpy_dtype`
+        capacity (int): Number of frames kept
+
+    Examples
+    --------
+    >>> ec.enable_monitor_history(capacity=1250)  # 10 s at 8 ms
+    >>> threading.Thread(target=ec.monitor_run, daemon=True).start()
+    >>> torque = ec.monitor_history.history("torque", since=t_ms)
+    >>> frames = ec.monitor_history.last(125)
+    >>> frames["machinePos"].mean(axis=0)
+    """
+
+    def __init__(self, dtype: Any, capacity: int) -> None:
+        if np is None:
+            raise ImportError(
+                "NumPy is required, install it with pip install pmr_elirobots_sdk[numpy]"
+            )
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.frames = np.zeros(capacity, dtype)
+        self._rows = self.frames.view(np.uint8).reshape(capacity, dtype.itemsize)
+        self._count = 0  # Frames appended since creation
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Frames appended since creation, including the overwritten ones"""
+        return self._count
+
+    def frame_view(self, buffer: bytearray) -> Any:
+        """Bytes view of a receive buffer, created once and passed to `push`"""
+        return np.frombuffer(buffer, np.uint8, count=self._rows.shape[1])
+
+    def push(self, frame: Any) -> None:
+        """Append one frame
+
+        Args
+        ----
+            frame (numpy.ndarray): Frame bytes, from `frame_view`
+        """
+        self._rows[self._count % self.capacity] = frame
+        self._count += 1
+
+    def last(self, n: Optional[int] = None) -> Any:
+        """Last `n` frames, oldest first
+
+        Args
+        ----
+            n (Optional[int], optional): Number of frames. Defaults to all the kept frames.
+
+        Returns
+        -------
+            numpy.ndarray: Structured array of frames, a view unless the range wraps
+        """
+        count = self._count
+        kept = min(count, self.capacity)
+        n = kept if n is None else max(min(n, kept), 0)
+        return self._range(count - n, count, None)
+
+    def history(self, field: str, since: Optional[int] = None) -> Any:
+        """Values of one field, oldest first
+
+        Args
+        ----
+            field (str): Field name, e.g. "machinePos" or "torque"
+            since (int, optional): Minimum TimeStamp (controller ms). Defaults to all kept frames.
+
+        Returns
+        -------
+            numpy.ndarray: One value or row per frame, a view unless the range wraps
+        """
+        count = self._count
+        first = count - min(count, self.capacity)
+        if since is not None:
+            first = self._search(first, count, since)
+        return self._range(first, count, field)
+
+    def _search(self, first: int, last: int, since: int) -> int:
+        """First logical index in [first, last) whose TimeStamp is >= since"""
+        stamps = self.frames["TimeStamp"]
+        start = first % self.capacity
+        stop = start + last - first
+        if stop <= self.capacity:
+            return first + int(np.searchsorted(stamps[start:stop], since))
+
+        head = stamps[start:]
+        if head[-1] >= since:
+            return first + int(np.searchsorted(head, since))
+        tail = stamps[: stop - self.capacity]
+        return first + len(head) + int(np.searchsorted(tail, since))
+
+    def _range(self, first: int, last: int, field: Optional[str]) -> Any:
+        """Frames with logical indices [first, last), as a view when contiguous"""
+        data = self.frames if field is None else self.frames[field]
+        start = first % self.capacity
+        stop = start + last - first
+        if stop <= self.capacity:
+            return data[start:stop]
+        return np.concatenate((data[start:], data[: stop - self.capacity]))
@@ -46,12 +46,10 @@ class ECInfo(BaseEC):
         >>> ec = EC(ip="192.168.1.200", auto_connect=True)
         >>> print(ec.servo_version) # => 轴1对应伺服版本为11 轴2对应伺服版本为11 轴3对应伺服版本为11 轴4对应伺服版本为11 轴5对应伺服版本为11 轴6对应伺服版本为11
         """
+        versions = self.send_many([("getJointVersion", {"axis": i}) for i in range(6)])
         servo_versions = ""
-        for i in range(6):
-            servo_versions += "轴%i对应伺服版本为%i\n" % (
-                i + 1,
-                self.send_CMD("getJointVersion", {"axis": i}),
-            )
+        for i, version in enumerate(versions):
+            servo_versions += "轴%i对应伺服版本为%i\n" % (i + 1, version.result)
         return servo_versions
 
     def _get_pose(self):
@@ -114,7 +112,9 @@ class ECInfo(BaseEC):
         >>> ec = EC(ip="192.168.1.200", auto_connect=True)
         >>> print(ec.current_pose)  # => [-116.42876928044629, -445.8173561092616, 330.01911829033054, -2.528732975547022, -0.23334446132951653, 2.9722706513750343]
         """
-        return self.get_tcp_pose()
+        return self._monitor_or_send(
+            "machinePose", "get_tcp_pose", {"coordinate_num": -1, "tool_num": -1}
+        )
 
     def _get_joint(self) -> List[float]:
         """获取当前机器人的关节信息
@@ -141,7 +141,7 @@ class ECInfo(BaseEC):
     @property
     def current_joint(self) -> List[float]:
         """当前关节信息"""
-        return self.get_joint()
+        return self._monitor_or_send("machinePos", "get_joint_pos")
 
     def get_motor_pos(self) -> List[float]:
         """获取机器人输入端关节信息(该信息为从电机直接获取的数据)
@@ -483,7 +483,7 @@ class ECInfo(BaseEC):
         -------
             int: 0:未发生碰撞,1:发生碰撞
         """
-        return self.send_CMD("getCollisionState")
+        return self._monitor_or_send("collision", "getCollisionState")
 
     def clear_collision_alarm(self) -> bool:
         """清楚碰撞状态(启动不能无法复位碰撞状态)
@@ -569,7 +569,7 @@ class ECInfo(BaseEC):
         Returns:
             List[float]: 所有的连杆数据
         """
-        link = [self.send_CMD("getDH", {"index": i}) for i in range(11)]
+        link = self.send_many([("getDH", {"index": i}) for i in range(11)])
         return link
 
     @property
@@ -650,20 +650,16 @@ class ECInfo(BaseEC):
         -------
             list: [使能状态, [正常功率,缩减功率], [正常动量,缩减动量], [正常工具力,缩减工具力], [正常肘部力,缩减肘部力], [正常速度百分比,缩减速度百分比]]
         """
-        safety_enable = self.send_CMD("getRobotSafetyParamsEnabled")
-        safety_power = self.send_CMD("getRobotSafeyPower")
-        safety_momentum = self.send_CMD("getRobotSafetyMomentum")
-        safety_toolForce = self.send_CMD("getRobotSafetyToolForce")
-        safety_elbowForce = self.send_CMD("getRobotSafetyElbowForce")
-        safety_speed_percentage = self.send_CMD("getRobotSpeedPercentage")
-        return [
-            safety_enable,
-            safety_power,
-            safety_momentum,
-            safety_toolForce,
-            safety_elbowForce,
-            safety_speed_percentage,
-        ]
+        return self.send_many(
+            [
+                ("getRobotSafetyParamsEnabled", None),
+                ("getRobotSafeyPower", None),
+                ("getRobotSafetyMomentum", None),
+                ("getRobotSafetyToolForce", None),
+                ("getRobotSafetyElbowForce", None),
+                ("getRobotSpeedPercentage", None),
+            ]
+        )
 
     @property
     def joint_speed(self) -> List[float]:
@@ -681,7 +677,7 @@ class ECInfo(BaseEC):
         Returns:
             float: 对应tcp速度
         """
-        return self.send_CMD("get_tcp_speed")
+        return self._monitor_or_send("tcp_speed", "get_tcp_speed")
 
     @property
     def joint_acc(self) -> float:
@@ -720,7 +716,7 @@ class ECInfo(BaseEC):
         -------
             List[float]: [torque_1,torque_2,torque_3,torque_4,torque_5,torque_6,torque_7,torque_8]
         """
-        return self.send_CMD("getRobotTorques")
+        return self._monitor_or_send("torque", "getRobotTorques")
 
     @property
     def encoder_values(self) -> List[float]:
@@ -811,9 +807,12 @@ class ECInfo(BaseEC):
             Optional[Union[List[float], float]]: [最大启动速度,力矩误差]/最大启动速度/力矩误差
         """
         if mode == 0 or mode == None:
-            max_speed: float = self.send_CMD("getRobotDragStartupMaxSpeed")
-            max_torque: float = self.send_CMD("getRobotTorqueErrorMaxPercents")
-            return [max_speed, max_torque]
+            return self.send_many(
+                [
+                    ("getRobotDragStartupMaxSpeed", None),
+                    ("getRobotTorqueErrorMaxPercents", None),
+                ]
+            )
         elif mode == 1:
             max_speed: float = self.send_CMD("getRobotDragStartupMaxSpeed")
             return max_speed
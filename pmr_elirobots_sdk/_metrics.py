@@ -0,0 +1,203 @@
+"""
+Description: Per-command latency histograms of port 8055 and 8056 frame statistics
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from pmr_elirobots_sdk.types import LatencyHistogram, MethodMetrics, MonitorStats
+
+BUCKET_COUNT = 24
+# Upper bound of every bucket but the last one, which counts everything above
+BUCKET_BOUNDS_US = tuple(2**i for i in range(BUCKET_COUNT - 1))
+
+
+def _bucket(ns: int) -> int:
+    """Index of the bucket counting a duration, bucket i holds [2**(i-1), 2**i) µs"""
+    return min((ns // 1000).bit_length(), BUCKET_COUNT - 1)
+
+
+class _Histogram:
+    """Fixed size histogram, updated under the lock of its method"""
+
+    __slots__ = ("counts", "total_ns")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.total_ns = 0
+
+    def add(self, ns: int) -> None:
+        self.counts[_bucket(ns)] += 1
+        self.total_ns += ns
+
+    def snapshot(self) -> LatencyHistogram:
+        return LatencyHistogram(BUCKET_BOUNDS_US, tuple(self.counts), self.total_ns)
+
+
+class _MethodRecorder:
+    """Counters and histograms of one controller method"""
+
+    __slots__ = ("lock", "count", "errors", "send", "wait", "decode")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.send = _Histogram()
+        self.wait = _Histogram()
+        self.decode = _Histogram()
+
+
+class CmdMetrics:
+    """Call counts, error counts and latency histograms of port 8055 methods
+
+    Enabled with `BaseEC.enable_metrics`. Each method has its own lock, held only
+    for a few integer increments, so threads calling different methods never
+    contend. Durations are split in:
+
+    - send: encoding the request and writing it to the socket
+    - wait: from the end of the write until the reply is received
+    - decode: parsing the reply into a CmdResponse
+
+    Examples
+    --------
+    >>> metrics = ec.enable_metrics()
+    >>> ec.state
+    >>> print(metrics.snapshot()["getRobotState"].wait.percentile_us(0.99))
+    """
+
+    def __init__(self) -> None:
+        self._methods: Dict[str, _MethodRecorder] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        cmd: str,
+        send_ns: Optional[int] = None,
+        wait_ns: Optional[int] = None,
+        decode_ns: Optional[int] = None,
+        error: bool = False,
+    ) -> None:
+        """Account one call of `cmd`, durations left to None are not recorded"""
+        rec = self._methods.get(cmd)
+        if rec is None:
+            with self._lock:
+                rec = self._methods.setdefault(cmd, _MethodRecorder())
+
+        with rec.lock:
+            rec.count += 1
+            if error:
+                rec.errors += 1
+            if send_ns is not None:
+                rec.send.add(send_ns)
+            if wait_ns is not None:
+                rec.wait.add(wait_ns)
+            if decode_ns is not None:
+                rec.decode.add(decode_ns)
+
+    def snapshot(self) -> Dict[str, MethodMetrics]:
+        """Copy of the current counters
+
+        Returns
+        -------
+            Dict[str, MethodMetrics]: Metrics of every method called since the last reset
+        """
+        with self._lock:
+            methods = list(self._methods.items())
+
+        snapshot = {}
+        for cmd, rec in methods:
+            with rec.lock:
+                snapshot[cmd] = MethodMetrics(
+                    rec.count,
+                    rec.errors,
+                    rec.send.snapshot(),
+                    rec.wait.snapshot(),
+                    rec.decode.snapshot(),
+                )
+        return snapshot
+
+    def reset(self) -> None:
+        """Clear every counter and histogram"""
+        with self._lock:
+            self._methods = {}
+
+
+class MonitorMetrics:
+    """Frame loss and jitter of the 8056 stream, updated by the monitor thread
+
+    The controller sends a frame every `period_ms`. Frames missing between two
+    consecutive TimeStamps are counted as lost, what is left of the interval
+    after removing whole periods is the controller jitter. The host jitter
+    compares the receive interval with the TimeStamp interval, it grows when
+    the host is late reading the socket.
+
+    Examples
+    --------
+    >>> stats = ec.monitor_stats
+    >>> print(stats.lost, stats.host_jitter.percentile_us(0.99))
+    """
+
+    def __init__(self, period_ms: int) -> None:
+        self.period_ms = period_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every counter and histogram"""
+        with self._lock:
+            self._frames = 0
+            self._lost = 0
+            self._gaps = 0
+            self._reconnects = 0
+            self._controller = _Histogram()
+            self._host = _Histogram()
+            self._last_stamp: Optional[int] = None
+            self._last_ns = 0
+
+    def restart(self) -> None:
+        """Forget the last frame, the interval to the next one is not measured"""
+        with self._lock:
+            self._last_stamp = None
+
+    def record_frame(self, stamp_ms: int, recv_ns: int) -> None:
+        """Account one frame
+
+        Args
+        ----
+            stamp_ms (int): Controller TimeStamp of the frame, in ms
+            recv_ns (int): Host receive time, `time.monotonic_ns()`
+        """
+        with self._lock:
+            self._frames += 1
+            if self._last_stamp is not None:
+                delta_ms = stamp_ms - self._last_stamp
+                periods = max(round(delta_ms / self.period_ms), 1)
+                if periods > 1:
+                    self._gaps += 1
+                    self._lost += periods - 1
+                self._controller.add(abs(delta_ms - periods * self.period_ms) * 10**6)
+                self._host.add(abs(recv_ns - self._last_ns - delta_ms * 10**6))
+            self._last_stamp = stamp_ms
+            self._last_ns = recv_ns
+
+    def record_reconnect(self) -> None:
+        with self._lock:
+            self._reconnects += 1
+
+    def snapshot(self) -> MonitorStats:
+        """Copy of the current counters
+
+        Returns
+        -------
+            MonitorStats: Statistics since the last reset
+        """
+        with self._lock:
+            return MonitorStats(
+                self._frames,
+                self._lost,
+                self._gaps,
+                self._reconnects,
+                self._controller.snapshot(),
+                self._host.snapshot(),
+            )
@@ -12,6 +12,47 @@ import socket
 import struct
 import threading
 import time
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pmr_elirobots_sdk._history import MonitorHistory
+from pmr_elirobots_sdk._metrics import MonitorMetrics
+from pmr_elirobots_sdk._recorder import MonitorRecorder
+from pmr_elirobots_sdk.types import MonitorStats
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, see the "numpy" extra
+    np = None
+
+T = TypeVar("T")
+
+# Big-endian NumPy type of each struct format character used by the 8056 layout
+_NUMPY_TYPES = {
+    "b": "i1",
+    "B": "u1",
+    "h": ">i2",
+    "H": ">u2",
+    "i": ">i4",
+    "I": ">u4",
+    "q": ">i8",
+    "Q": ">u8",
+    "f": ">f4",
+    "d": ">f8",
+}
+
+# Decoders built by ECMonitorInfo.compile, per layout, frame size and field subset
+_COMPILED: Dict[tuple, Tuple[struct.Struct, List[Tuple[str, int, Optional[int]]]]] = {}
 
 
 class ECMonitorInfo:
@@ -44,6 +85,93 @@ class ECMonitorInfo:
     _ec_struct["tcpacc"] = "d"
     _ec_struct["jointacc"] = "d" * 8
 
+    @classmethod
+    def compile(
+        cls, size: int, only: Optional[Collection[str]] = None
+    ) -> Tuple[struct.Struct, List[Tuple[str, int, Optional[int]]]]:
+        """Compile the fields held in the first `size` bytes of a frame
+
+        Args
+        ----
+            size (int): Usable frame length in bytes
+            only (Collection[str], optional): Fields to decode. Defaults to all fields.
+
+        Returns
+        -------
+            Tuple[struct.Struct, List[Tuple[str, int, Optional[int]]]]: Struct decoding
+            all the fields at once and, per field, its name and the slice of the
+            unpacked values holding it, stop is None for scalar fields
+        """
+        key = (cls, size, None if only is None else frozenset(only))
+        compiled = _COMPILED.get(key)
+        if compiled is not None:
+            return compiled
+
+        fmt = "!"
+        fields = []
+        n_values = 0
+        for name, field_fmt in cls._ec_struct.items():
+            if struct.calcsize(fmt + field_fmt) > size:
+                break
+            if only is not None and name not in only:
+                fmt += f"{struct.calcsize('!' + field_fmt)}x"
+                continue
+            fmt += field_fmt
+            stop = n_values + len(field_fmt) if len(field_fmt) > 1 else None
+            fields.append((name, n_values, stop))
+            n_values += len(field_fmt)
+        compiled = _COMPILED[key] = (struct.Struct(fmt), fields)
+        return compiled
+
+    @classmethod
+    def field_offsets(cls, size: int) -> Dict[str, Tuple[int, str]]:
+        """Byte offset and struct format of the fields held in the first `size` bytes"""
+        offsets = {}
+        offset = 0
+        for name, field_fmt in cls._ec_struct.items():
+            end = offset + struct.calcsize("!" + field_fmt)
+            if end > size:
+                break
+            offsets[name] = (offset, field_fmt)
+            offset = end
+        return offsets
+
+    @classmethod
+    def numpy_dtype(cls, size: Optional[int] = None) -> Any:
+        """Structured NumPy dtype of the fields held in the first `size` bytes of a frame
+
+        Args
+        ----
+            size (int, optional): Usable frame length in bytes. Defaults to the whole layout.
+
+        Returns
+        -------
+            numpy.dtype: Big-endian packed dtype, array fields such as machinePos have a shape
+
+        Raises
+        ------
+            ImportError: NumPy is not installed
+        """
+        if np is None:
+            raise ImportError(
+                "NumPy is required, install it with pip install pmr_elirobots_sdk[numpy]"
+            )
+
+        if size is None:
+            size = cls.message_size()
+        frame_struct, fields = cls.compile(size)
+        descr = []
+        for name, start, stop in fields:
+            field_fmt = cls._ec_struct[name]
+            if stop is None:
+                descr.append((name, _NUMPY_TYPES[field_fmt]))
+            else:
+                descr.append((name, _NUMPY_TYPES[field_fmt[0]], (stop - start,)))
+
+        dtype = np.dtype(descr)
+        assert dtype.itemsize == frame_struct.size
+        return dtype
+
     def __init__(self) -> None:
         self.MessageSize = None
         self.TimeStamp = None
@@ -69,6 +197,210 @@ class ECMonitorInfo:
         self.joint_speed = [None] * 8
         self.tcpacc = [None] * 6
         self.jointacc = [None] * 8
+        # Fields only present in layouts registered with register_monitor_layout
+        for name, field_fmt in self._ec_struct.items():
+            if name not in vars(self):
+                default = [None] * len(field_fmt) if len(field_fmt) > 1 else None
+                setattr(self, name, default)
+
+    @classmethod
+    def message_size(cls) -> int:
+        """Size in bytes of a frame holding every field of the layout"""
+        return struct.calcsize("!" + "".join(cls._ec_struct.values()))
+
+
+# 8056 layouts, ECMonitorInfo subclasses, by MessageSize and by software version
+_LAYOUTS_BY_SIZE: Dict[int, Type[ECMonitorInfo]] = {}
+_LAYOUTS_BY_VERSION: Dict[str, Type[ECMonitorInfo]] = {}
+
+
+def register_monitor_layout(
+    layout: Type[ECMonitorInfo], versions: Iterable[str] = ()
+) -> Type[ECMonitorInfo]:
+    """Register the 8056 layout of a controller firmware
+
+    A layout is an `ECMonitorInfo` subclass whose `_ec_struct` lists the fields
+    of the frame in order. It is selected on connect for the controller
+    software `versions` given here, or for frames of its `message_size()`.
+
+    Args
+    ----
+        layout (Type[ECMonitorInfo]): Subclass describing the frame
+        versions (Iterable[str], optional): Versions using it, e.g. "3.6.0". Defaults to ().
+
+    Returns
+    -------
+        Type[ECMonitorInfo]: `layout`
+
+    Examples
+    --------
+    >>> class ECMonitorInfoV37(ECMonitorInfo):
+    >>>     _ec_struct = collections.OrderedDict(ECMonitorInfo._ec_struct)
+    >>>     _ec_struct["new_field"] = "d" * 6
+    >>> register_monitor_layout(ECMonitorInfoV37, versions=["3.7.0"])
+    """
+    _LAYOUTS_BY_SIZE[layout.message_size()] = layout
+    for version in versions:
+        _LAYOUTS_BY_VERSION[version.lstrip("v")] = layout
+    return layout
+
+
+def monitor_layout(msg_size: int, version: Optional[str] = None) -> Type[ECMonitorInfo]:
+    """Layout of the frames sent by a controller
+
+    Args
+    ----
+        msg_size (int): MessageSize announced by the controller
+        version (Optional[str], optional): Software version, e.g. "v3.6.0". Defaults to None.
+
+    Returns
+    -------
+        Type[ECMonitorInfo]: Layout registered for `version`, else for `msg_size`,
+        else the largest one not exceeding `msg_size` since newer firmware only
+        appends fields, else the smallest one
+    """
+    if version is not None and version.lstrip("v") in _LAYOUTS_BY_VERSION:
+        return _LAYOUTS_BY_VERSION[version.lstrip("v")]
+    if msg_size in _LAYOUTS_BY_SIZE:
+        return _LAYOUTS_BY_SIZE[msg_size]
+    fitting = [size for size in _LAYOUTS_BY_SIZE if size <= msg_size]
+    return _LAYOUTS_BY_SIZE[max(fitting) if fitting else min(_LAYOUTS_BY_SIZE)]
+
+
+register_monitor_layout(ECMonitorInfo)
+
+
+class _LazyFields:
+    """Fields selected with `set_monitor_fields` are decoded with the frame
+
+    The other fields are decoded from a copy of the frame on first access.
+    """
+
+    __slots__ = ("_frame", "_lazy_fields")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing from the instance, i.e. not decoded yet
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            field_struct, offset, is_list = self._lazy_fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        values = field_struct.unpack_from(self._frame, offset)
+        value = list(values) if is_list else values[0]
+        setattr(self, name, value)  # Same value on every access, decoded once
+        return value
+
+
+_LAZY_LAYOUTS: Dict[Type[ECMonitorInfo], Type[ECMonitorInfo]] = {}
+
+
+def _lazy_layout(layout: Type[ECMonitorInfo]) -> Type[ECMonitorInfo]:
+    """Variant of `layout` decoding the fields not selected on first access"""
+    lazy = _LAZY_LAYOUTS.get(layout)
+    if lazy is None:
+        lazy = type(f"_Lazy{layout.__name__}", (_LazyFields, layout), {"__slots__": ()})
+        _LAZY_LAYOUTS[layout] = lazy
+    return lazy
+
+
+class _MonitorStream:
+    """Receive buffers and decoding state of one 8056 connection
+
+    Frames are received alternately into two preallocated buffers, the one
+    being received into is never the one published in `monitor_record`. A
+    record is received into again as soon as the frame after it is published.
+    """
+
+    def __init__(self, monitor: "ECMonitor") -> None:
+        self.monitor = monitor
+        layout = monitor.monitor_layout
+        self.info_cls = layout
+        # Layout compiled once, every frame is then decoded in a single call
+        only = monitor._monitor_fields
+        if only is not None:
+            only = set(only) | {"MessageSize", "TimeStamp"}  # Checked on every frame
+        frame_struct, self.fields = layout.compile(monitor.unpack_size, only)
+        self.unpack_from = frame_struct.unpack_from
+        # Fields past unpack_size keep the values of a fresh layout instance
+        self.defaults = vars(layout())
+        self.lazy_fields: Optional[Dict[str, Tuple[struct.Struct, int, bool]]] = None
+        if only is not None:
+            self.info_cls = _lazy_layout(layout)
+            offsets = layout.field_offsets(monitor.unpack_size)
+            self.lazy_fields = {
+                name: (struct.Struct("!" + field_fmt), offset, len(field_fmt) > 1)
+                for name, (offset, field_fmt) in offsets.items()
+                if name not in only
+            }
+            self.defaults = {
+                name: value
+                for name, value in self.defaults.items()
+                if name not in offsets
+            }
+        self.msg_size = monitor.MSG_SIZE
+        self.buffers = [bytearray(self.msg_size), bytearray(self.msg_size)]
+        self.views = [memoryview(buffer) for buffer in self.buffers]
+        self.back = 0  # Buffer the next frame is received into
+        self.received = 0  # Bytes of the next frame already received, when non-blocking
+
+        self.records: List[Any] = [None, None]
+        if np is not None:
+            dtype = layout.numpy_dtype(monitor.unpack_size)
+            self.records = [np.frombuffer(b, dtype, count=1)[0] for b in self.buffers]
+        self.history = None
+        if monitor._history_capacity:
+            self.history = MonitorHistory(
+                layout.numpy_dtype(monitor.unpack_size),
+                monitor._history_capacity,
+            )
+            self.frames = [self.history.frame_view(b) for b in self.buffers]
+            monitor.monitor_history = self.history
+
+    def publish(self) -> bool:
+        """Decode the frame received in the back buffer and publish it
+
+        Returns
+        -------
+            bool: False if the frame header is abnormal, nothing is published then
+        """
+        recv_ns = time.time_ns()
+        recv_mono_ns = time.monotonic_ns()
+        monitor = self.monitor
+        back = self.back
+        buffer = self.buffers[back]
+        values = self.unpack_from(buffer)
+        if values[0] != self.msg_size:
+            return False
+
+        decoded = dict(self.defaults)
+        for name, start, stop in self.fields:
+            if stop is None:
+                decoded[name] = values[start]
+            else:
+                decoded[name] = list(values[start:stop])
+        info = self.info_cls.__new__(self.info_cls)
+        if self.lazy_fields is not None:
+            info._frame = bytes(buffer)  # type: ignore[attr-defined]
+            info._lazy_fields = self.lazy_fields  # type: ignore[attr-defined]
+        vars(info).update(decoded)
+
+        # Single reference assignments, readers see the old or the new frame
+        monitor.monitor_info = info
+        monitor.monitor_record = self.records[back]
+        if self.history is not None:
+            self.history.push(self.frames[back])
+        recorder = monitor.monitor_recorder
+        if recorder is not None:
+            recorder.record(buffer, recv_ns)
+        monitor._monitor_time = recv_mono_ns / 1e9
+        monitor._monitor_metrics.record_frame(info.TimeStamp, recv_mono_ns)
+        with monitor._monitor_cond:
+            monitor._monitor_seq += 1
+            monitor._monitor_cond.notify_all()
+        monitor._monitor_recv_flag = True
+        self.back = back ^ 1
+        return True
 
 
 class ECMonitor:
@@ -79,16 +411,222 @@ class ECMonitor:
 
     _PORT = 8056
 
+    # Age in seconds up to which a frame answers the getters, None queries port 8055
+    monitor_max_age: Optional[float] = None
+
+    # Seconds without a frame after which wait_stop falls back to polling port 8055
+    _MONITOR_STALL = 0.1
+
+    # Layout of the frames, selected on connect by monitor_layout()
+    monitor_layout: Type[ECMonitorInfo] = ECMonitorInfo
+    # Controller software version, queried on connect when layouts are registered by
+    # version and port 8055 is connected
+    monitor_version: Optional[str] = None
+
     def __init__(self) -> None:
+        super().__init__()
         # self.robot_ip = ip
         self.monitor_info = ECMonitorInfo()
+        # Zero-copy view of the last frame when NumPy is installed, see monitor_run
+        self.monitor_record: Any = None
+        self.monitor_history: Optional[MonitorHistory] = None
+        self._history_capacity = 0
+        self._monitor_fields: Optional[List[str]] = None
+        self.monitor_recorder: Optional[MonitorRecorder] = None
         self._monitor_recv_flag = False  # Whether data reception has started
-        self._monitor_lock = threading.Lock()
+        self._monitor_time = float("-inf")  # time.monotonic() of the last frame
+        self._monitor_seq = 0  # Frames published, under _monitor_cond
+        self._monitor_cond = threading.Condition()  # Notified on every frame
+        self._monitor_metrics = MonitorMetrics(self.__SEND_FREQ)
+
+    @property
+    def monitor_stats(self) -> MonitorStats:
+        """Lost frames, reconnections and jitter of the 8056 stream
+
+        Returns
+        -------
+            MonitorStats: Statistics since creation or the last `reset_monitor_stats`
+
+        Examples
+        --------
+        >>> stats = ec.monitor_stats
+        >>> print(stats.lost, stats.gaps, stats.host_jitter.percentile_us(0.99))
+        """
+        return self._monitor_metrics.snapshot()
+
+    def read_monitor_record(self, read: Callable[[Any], T]) -> T:
+        """Apply `read` to `monitor_record`, again if a new frame overlapped it
+
+        The frame counter is checked before and after `read`, a record is only
+        overwritten after a newer frame was counted, so the values returned all
+        come from one frame. `read` must copy what it keeps, e.g. with `tolist()`.
+
+        Args
+        ----
+            read (Callable[[Any], T]): Reads fields of the record, without side effects
+
+        Returns
+        -------
+            T: Result of `read` on a record left unchanged during the call
+
+        Examples
+        --------
+        >>> joint, state = ec.read_monitor_record(
+        >>>     lambda r: (r["machinePos"].tolist(), int(r["robotState"]))
+        >>> )
+        """
+        while True:
+            seq = self._monitor_seq
+            value = read(self.monitor_record)
+            if self._monitor_seq == seq:
+                return value
+
+    def reset_monitor_stats(self) -> None:
+        """Clear the counters and histograms of `monitor_stats`"""
+        self._monitor_metrics.reset()
+
+    def set_monitor_fields(self, fields: Optional[Iterable[str]]) -> None:
+        """Decode only `fields` of every frame, the others when first accessed
+
+        Call before starting `monitor_run`. Skipped fields cost nothing per frame,
+        reading one from `monitor_info` decodes it from a copy of its frame.
+
+        Args
+        ----
+            fields (Optional[Iterable[str]]): `ECMonitorInfo` field names, None decodes all of them
+
+        Examples
+        --------
+        >>> ec.set_monitor_fields(["machinePos", "robotState", "digital_ioInput"])
+        >>> ec.monitor_thread_run()
+        """
+        if fields is not None:
+            fields = list(fields)
+            known = set(ECMonitorInfo._ec_struct)
+            for layout in [*_LAYOUTS_BY_SIZE.values(), *_LAYOUTS_BY_VERSION.values()]:
+                known.update(layout._ec_struct)
+            unknown = set(fields).difference(known)
+            if unknown:
+                raise ValueError(f"Unknown monitor fields: {sorted(unknown)}")
+        self._monitor_fields = fields
+
+    def enable_monitor_history(self, capacity: int = 7500) -> None:
+        """Keep the last `capacity` frames in `monitor_history`, requires NumPy
+
+        Call before starting `monitor_run`, the history is allocated once the
+        frame size is known.
+
+        Args
+        ----
+            capacity (int, optional): Number of frames kept. Defaults to 7500, 60 s at 8 ms.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._history_capacity = capacity
+
+    def start_monitor_recording(
+        self,
+        directory: str,
+        prefix: str = "monitor",
+        segment_frames: int = 75000,
+        max_pending: int = 1250,
+    ) -> MonitorRecorder:
+        """Record every monitor frame to segmented files, see `MonitorRecorder`
+
+        Can be called before or while `monitor_run` runs, a recording already in
+        progress is stopped first.
+
+        Args
+        ----
+            directory (str): Directory of the segment files, created if missing
+            prefix (str, optional): Start of the segment file names. Defaults to "monitor".
+            segment_frames (int, optional): Frames per segment. Defaults to 75000, 10 min at 8 ms.
+            max_pending (int, optional): Frames buffered for the writer. Defaults to 1250 (10 s).
+
+        Returns
+        -------
+            MonitorRecorder: Recorder whose `written` and `dropped` count the frames
+        """
+        self.stop_monitor_recording()
+        self.monitor_recorder = MonitorRecorder(
+            directory,
+            list(self.monitor_layout._ec_struct.items()),
+            prefix,
+            segment_frames,
+            max_pending,
+        )
+        return self.monitor_recorder
+
+    def stop_monitor_recording(self) -> None:
+        """Stop the recording, frames still queued are written before returning"""
+        recorder, self.monitor_recorder = self.monitor_recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    def enable_monitor_getters(self, max_age: float = 0.05) -> None:
+        """Answer the state and position getters from the monitor stream
+
+        `state`, `mode`, `estop_status`, `current_joint`, `current_pose`,
+        `joint_torques`, `tcp_speed` and `is_collision` then read the last 8056
+        frame instead of sending a command, as long as it was received less than
+        `max_age` seconds ago. Older frames, or a monitor that is not running,
+        fall back to port 8055.
+
+        Args
+        ----
+            max_age (float, optional): Maximum frame age in seconds. Defaults to 0.05.
+
+        Examples
+        --------
+        >>> ec.monitor_thread_run()
+        >>> ec.enable_monitor_getters(max_age=0.024)
+        >>> ec.current_joint  # No round trip to port 8055
+        >>> ec.monitor_max_age = None  # Disable
+        """
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+        self.monitor_max_age = max_age
+
+    def _monitor_value(self, field: str) -> Any:
+        """Value of `field` in the last frame, None when it is too old or not decoded"""
+        max_age = self.monitor_max_age
+        # Read the time before the frame, a frame published in between is only newer
+        if max_age is None or time.monotonic() - self._monitor_time > max_age:
+            return None
+        value = getattr(self.monitor_info, field)
+        if isinstance(value, list):
+            return None if value[0] is None else list(value)
+        return value
+
+    def _monitor_wait_stop(self, deadline: Optional[float]) -> Optional[int]:
+        """Wait for a frame whose robotState is not PLAY
+
+        Returns
+        -------
+            Optional[int]: robotState, PLAY at the deadline, None without fresh frames
+        """
+        play = self.RobotState.PLAY
+        cond = self._monitor_cond
+        with cond:
+            # The next frame may have been sent before the move command was handled
+            first = self._monitor_seq + 2
+            while time.monotonic() - self._monitor_time <= self._MONITOR_STALL:
+                state = self.monitor_info.robotState
+                if state is None:
+                    return None  # Not in the layout of this controller
+                if self._monitor_seq >= first and state != play:
+                    return state
+
+                wait = self._MONITOR_STALL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return play
+                cond.wait(wait)
+        return None
 
     def __first_connect(self) -> None:
         """Initial connection, receive and parse the 8056 data packet length for the current version"""
-        # Get the data length information for the current ECMonitorInfo version
-        self.__current_msg_size_get()
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(5)
@@ -96,11 +634,7 @@ class ECMonitor:
             byte_msg_size = sock.recv(struct.calcsize(self._FMT_MSG_SIZE))
             sock.shutdown(2)
             sock.close()
-            self.MSG_SIZE = struct.unpack("!" + self._FMT_MSG_SIZE, byte_msg_size)[
-                0
-            ]  # Actual robot byte length
-            # Parse the usable byte length
-            self.__msg_size_judgment()
+            self._monitor_set_size(byte_msg_size)
         except socket.timeout as e:
             print(f"Connect IP : {self.robot_ip} Port : {self._PORT} timeout")
             sock.shutdown(2)
@@ -109,16 +643,19 @@ class ECMonitor:
     def __current_msg_size_get(self) -> None:
         """Get all data length information for the current version"""
         temp = 0
-        for i in ECMonitorInfo._ec_struct.values():
+        for i in self.monitor_layout._ec_struct.values():
             temp += struct.calcsize(i)
 
         self.version_msg_size = int(temp)  # Total length for the ECMonitorInfo version
 
     def __msg_size_judgment(self):
         """Judge data length"""
+        # Layout of this controller, then the data length information for it
+        self.monitor_layout = monitor_layout(self.MSG_SIZE, self.monitor_version)
+        self.__current_msg_size_get()
         if self.version_msg_size > self.MSG_SIZE:
             self.unpack_size = self.MSG_SIZE
-        elif self.version_msg_size < self.MSG_SIZE:
+        else:
             self.unpack_size = self.version_msg_size  # Determine usable byte length based on current version and actual robot transmission
 
     def __socket_create(self):
@@ -126,57 +663,120 @@ class ECMonitor:
         self.sock_monitor = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.sock_monitor.connect((self.robot_ip, self._PORT))
 
+    def __recv_frame(self, view: memoryview) -> int:
+        """Receive one whole frame into `view`
+
+        Returns
+        -------
+            int: Number of bytes received, less than the frame size if the connection closed
+        """
+        size = len(view)
+        got = self.sock_monitor.recv_into(view, size, socket.MSG_WAITALL)
+        while 0 < got < size:  # MSG_WAITALL can still return early on signals
+            n = self.sock_monitor.recv_into(view[got:], size - got)
+            if n == 0:
+                break
+            got += n
+        return got
+
     def monitor_run(self):
-        """Monitoring program run"""
-        self.monitor_run_state = True
+        """Monitoring program run
+
+        Each frame is decoded into a new `ECMonitorInfo` published to
+        `monitor_info` with a single assignment, readers never wait for the
+        monitor thread and a reference they hold is never modified afterwards:
+
+        >>> info = ec.monitor_info  # Consistent frame
+        >>> print(info.TimeStamp, info.machinePos)
+
+        With NumPy installed, `monitor_record` also exposes the last frame as a
+        structured record over its receive buffer, e.g. `monitor_record["machinePos"]`
+        is a float64 array without any copy. Frames are received alternately into
+        two buffers, and the buffer of a record is received into again once the
+        next frame is published, microseconds later when frames are queued in the
+        socket. Read it through `read_monitor_record`, or `.copy()` it first.
+        """
+        stream = self._monitor_open()
+        while 1:
+            try:
+                received = self.__recv_frame(stream.views[stream.back])
+            except OSError as e:  # e.g. reset by the controller, handled as a cut
+                if self.monitor_run_state:
+                    self.logger.warning(f"8056 receive failed | Exception: {e}")
+                received = 0
+            self._recv_buf_size = received
+            self._tt += 1
+
+            if received < self.MSG_SIZE and not self.monitor_run_state:
+                # Stopped while waiting for the frame
+                self.sock_monitor.close()
+                break
+
+            # Re-establish connection if the frame is cut or its header is abnormal
+            if received < self.MSG_SIZE or not stream.publish():
+                try:
+                    self._monitor_reconnect()
+                except OSError as e:
+                    self.logger.error(f"8056 connection lost | Exception: {e}")
+                    self.monitor_run_state = False
+
+            # self.robot_info_print(is_clear_screen=True)
+            if self.monitor_run_state == False:
+                self.sock_monitor.close()
+                break
+        self._monitor_closed()
+
+    def _monitor_open(self) -> "_MonitorStream":
+        """Connect to port 8056 and prepare the decoding of its frames"""
+        self._monitor_begin()
         self.__first_connect()
         self.__socket_create()
+        return self._monitor_stream()
+
+    def _monitor_begin(self) -> None:
+        """First step of `_monitor_open`, queries the version on 8055 when needed"""
+        self.monitor_run_state = True
+        if self.monitor_version is None and _LAYOUTS_BY_VERSION and self.alive:
+            self.monitor_version = self.send_CMD("getSoftVersion").result
+
+    def _monitor_set_size(self, byte_msg_size: bytes) -> None:
+        """Select the layout from the MessageSize sent on a first connection"""
+        # Actual robot byte length
+        self.MSG_SIZE = struct.unpack("!" + self._FMT_MSG_SIZE, byte_msg_size)[0]
+        # Parse the usable byte length
+        self.__msg_size_judgment()
+        if self.monitor_recorder is not None:
+            self.monitor_recorder.layout = list(self.monitor_layout._ec_struct.items())
+
+    def _monitor_stream(self) -> "_MonitorStream":
+        """Last step of `_monitor_open`, once the frame size is known"""
         # ? Test
         self._tt = 0  # Total number of data receptions
         self.__br = 0  # Reconnection count
         # ? Test
+        self._monitor_metrics.restart()  # Frames of a previous run are not the last
+        return _MonitorStream(self)
 
-        while 1:
-            self._monitor_lock.acquire()
+    def _monitor_reconnect(self) -> None:
+        """Replace the 8056 connection after a cut or malformed frame"""
+        self.sock_monitor.close()
+        self.__socket_create()
+        self._monitor_reconnected()
 
-            buffer = None
-            buffer = self.sock_monitor.recv(self.MSG_SIZE, socket.MSG_WAITALL)
-            self._monitor_recv_flag = True
-            self._recv_buf_size = len(buffer)
-            self._tt += 1
+    def _monitor_reconnected(self) -> None:
+        """Called once a replacement 8056 connection is established"""
+        self._monitor_recv_flag = False
+        # ? Test
+        self.__br += 1
+        # ? Test
+        self._monitor_metrics.record_reconnect()
 
-            current_unpack_size = 0
-            for k, v in ECMonitorInfo._ec_struct.items():
-                if current_unpack_size >= self.unpack_size:
-                    break
-
-                # Calculate parsed length, byte split
-                fmt_size = struct.calcsize(v)
-                current_unpack_size += fmt_size
-                buff, buffer = buffer[:fmt_size], buffer[fmt_size:]
-                # Unpack
-                value = struct.unpack("!" + v, buff)
-
-                # Re-establish connection if header is abnormal
-                if k == "MessageSize" and value[0] != self.MSG_SIZE:
-                    self.sock_monitor.close()
-                    self.__socket_create()
-                    self._monitor_recv_flag = False
-                    # ? Test
-                    self.__br += 1
-                    # ? Test
-                    break
-
-                if len(v) > 1:
-                    setattr(self.monitor_info, k, [value[i] for i in range(len(v))])
-                else:
-                    setattr(self.monitor_info, k, value[0])
-
-            self._monitor_lock.release()
-            # self.robot_info_print(is_clear_screen=True)
-            if self.monitor_run_state == False:
-                self.sock_monitor.close()
-                break
+    def _monitor_closed(self) -> None:
+        """Called once the monitor stopped receiving frames"""
+        # Threads in wait_stop fall back to port 8055 without waiting for the stall
+        self._monitor_time = float("-inf")
+        with self._monitor_cond:
+            self._monitor_cond.notify_all()
 
     def monitor_info_print(self, t: float = 0.5, is_clear_screen: bool = False):
         """Continuously display current robot information
@@ -203,7 +803,9 @@ class ECMonitor:
             )
             spilt_line()
 
-            for k, v in vars(self.monitor_info).items():
+            info = self.monitor_info
+            for k in info._ec_struct:
+                v = getattr(info, k)
                 # Data requiring additional processing
                 if k == "TimeStamp":
                     v = time.gmtime(v // 1000)
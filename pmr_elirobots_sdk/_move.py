@@ -6,35 +6,18 @@ LastEditTime: 2022-11-11 17:25:15
 Description: Motion and task execution related
 """
 
-import time
 from typing import Optional
 
 from pmr_elirobots_sdk.types import CmdResponse
 
 from ._baseec import BaseEC
+from ._template import CmdTemplate
 
 
 class ECMove(BaseEC):
     """EC movement related class, all basic movement services are implemented here"""
 
-    def __wait_stop(self) -> None:
-        while True:
-            time.sleep(0.005)
-            result = self.RobotState(self.send_CMD("getRobotState").result)
-            if result != self.RobotState.PLAY:
-                if result != self.RobotState.STOP:
-                    str_ = [
-                        "",
-                        "Robot is in pause state",
-                        "Robot is in emergency stop state",
-                        "",
-                        "Robot is in error state",
-                        "Robot is in collision state",
-                    ]
-                    self.logger.debug(str_[result.value])
-                    break
-                break
-        self.logger.info("The robot has stopped")
+    _MOVE_SPEED_J = CmdTemplate("moveBySpeedj", "vj", "acc", "t")
 
     def stop(self) -> CmdResponse:
         """Stop robot movement
@@ -135,6 +118,7 @@ class ECMove(BaseEC):
         cond_value: Optional[int] = None,
         cond_judgement: Optional[str] = None,
         block: Optional[bool] = True,
+        timeout: Optional[float] = None,
     ) -> CmdResponse:
         """Joint motion, need to check robot motion status to determine if motion is complete after execution
 
@@ -148,6 +132,7 @@ class ECMove(BaseEC):
             cond_num (int, optional): IO address, 0~63
             cond_value (int, optional): IO status, 0/1, when IO status matches, immediately abandon this motion and execute next instruction
             block (bool, optional): True: blocking motion, False: non-blocking motion. Defaults to True.
+            timeout (float, optional): Seconds to wait for the stop. Defaults to None, no limit.
 
         Returns
         -------
@@ -169,7 +154,7 @@ class ECMove(BaseEC):
         if block:
             move_ret = self.send_CMD("moveByJoint", params)
             if move_ret.success:
-                self.__wait_stop()
+                self._wait_stop(timeout)
             return move_ret
         else:
             return self.send_CMD("moveByJoint", params)
@@ -186,6 +171,7 @@ class ECMove(BaseEC):
         cond_value: Optional[int] = None,
         cond_judgment: Optional[str] = None,
         block: Optional[bool] = True,
+        timeout: Optional[float] = None,
     ) -> CmdResponse:
         """Linear motion, need to check robot motion status to determine if motion is complete after execution
 
@@ -200,6 +186,7 @@ class ECMove(BaseEC):
             cond_num (int, optional): IO address, 0~63.
             cond_value (int, optional): IO status, 0/1, when IO status matches, immediately abandon this motion and execute next instruction.
             block (bool, optional): True: blocking motion, False: non-blocking motion. Defaults to True.
+            timeout (float, optional): Seconds to wait for the stop. Defaults to None, no limit.
 
         Returns
         -------
@@ -223,7 +210,7 @@ class ECMove(BaseEC):
         if block:
             move_ret = self.send_CMD("moveByLine", params)
             if move_ret.success:
-                self.__wait_stop()
+                self._wait_stop(timeout)
             return move_ret
         else:
             return self.send_CMD("moveByLine", params)
@@ -240,6 +227,7 @@ class ECMove(BaseEC):
         cond_num: Optional[int] = None,
         cond_value: Optional[int] = None,
         block: Optional[bool] = True,
+        timeout: Optional[float] = None,
     ) -> CmdResponse:
         """Arc motion, need to check robot motion status to determine if motion is complete after execution
 
@@ -254,6 +242,7 @@ class ECMove(BaseEC):
             cond_num (int, optional): IO address, 0~63.
             cond_value (int, optional): IO status, 0/1, when IO status matches, immediately abandon this motion and execute next instruction.
             block (bool, optional): True: blocking motion, False: non-blocking motion. Defaults to True.
+            timeout (float, optional): Seconds to wait for the stop. Defaults to None, no limit.
 
         Returns
         -------
@@ -276,7 +265,7 @@ class ECMove(BaseEC):
         if block:
             move_ret = self.send_CMD("moveByArc", params)
             if move_ret.success:
-                self.__wait_stop()
+                self._wait_stop(timeout)
             return move_ret
         else:
             return self.send_CMD("moveByArc", params)
@@ -294,7 +283,9 @@ class ECMove(BaseEC):
         -------
             bool: Execution result, True: execution successful, False: execution failed
         """
-        return self.send_CMD("moveBySpeedj", {"vj": vj, "acc": acc, "t": t})
+        if self.codec.dumps_value is None:
+            return self.send_CMD("moveBySpeedj", {"vj": vj, "acc": acc, "t": t})
+        return self.send_compiled_CMD(self._MOVE_SPEED_J, vj, acc, t)
 
     def move_stop_speed_j(self, stop_acc: int) -> CmdResponse:
         """Stop joint uniform motion
@@ -7,11 +7,14 @@ Description:
 """
 
 from ._baseec import BaseEC
+from ._template import CmdTemplate
 
 
 class ECMoveML(BaseEC):
     """ECMoveML类,实现时间戳服务(movml)相关的接口"""
 
+    _ML_PUSH = CmdTemplate("push_pos", "timestamp", "pos")
+
     # moveml运动
     def ml_init(
         self,
@@ -60,8 +63,12 @@ class ECMoveML(BaseEC):
         -------
             bool: True操作成功,False操作失败
         """
-        return self.send_CMD(
-            "push_pos", {"timestamp": time_stamp, "pos": pos}, ret_flag=self.ml_ret_flag
+        if self.codec.dumps_value is None:
+            return self.send_CMD(
+                "push_pos", {"timestamp": time_stamp, "pos": pos}, ret_flag=self.ml_ret_flag
+            )
+        return self.send_compiled_CMD(
+            self._ML_PUSH, time_stamp, pos, ret_flag=self.ml_ret_flag
         )
 
     def ml_end_push(self) -> bool:
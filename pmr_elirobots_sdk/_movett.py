@@ -10,11 +10,16 @@ import time
 from typing import List, Optional
 
 from ._baseec import BaseEC
+from ._template import CmdTemplate
 
 
 class ECMoveTT(BaseEC):
     """EC透传服务类,该类实现所有的透传相关接口"""
 
+    _TT_START_JOINT = CmdTemplate("tt_set_current_servo_joint", "targetPos")
+    _TT_ADD_JOINT = CmdTemplate("tt_put_servo_joint_to_buf", "targetPos")
+    _TT_ADD_POSE = CmdTemplate("tt_put_servo_joint_to_buf", "targetPose")
+
     # 透传运动部分
     def TT_init(
         self,
@@ -74,10 +79,14 @@ class ECMoveTT(BaseEC):
         -------
             bool: True操作成功,False操作失败
         """
-        return self.send_CMD(
-            "tt_set_current_servo_joint",
-            {"targetPos": joint},
-            ret_flag=self.TT_ret_flag,
+        if self.codec.dumps_value is None:
+            return self.send_CMD(
+                "tt_set_current_servo_joint",
+                {"targetPos": joint},
+                ret_flag=self.TT_ret_flag,
+            )
+        return self.send_compiled_CMD(
+            self._TT_START_JOINT, joint, ret_flag=self.TT_ret_flag
         )
 
     def TT_add_joint(self, joint: List[float]) -> bool:
@@ -91,8 +100,12 @@ class ECMoveTT(BaseEC):
         -------
             bool: True操作成功,False操作失败
         """
-        return self.send_CMD(
-            "tt_put_servo_joint_to_buf", {"targetPos": joint}, ret_flag=self.TT_ret_flag
+        if self.codec.dumps_value is None:
+            return self.send_CMD(
+                "tt_put_servo_joint_to_buf", {"targetPos": joint}, ret_flag=self.TT_ret_flag
+            )
+        return self.send_compiled_CMD(
+            self._TT_ADD_JOINT, joint, ret_flag=self.TT_ret_flag
         )
 
     def TT_add_pose(self, pose: List[float]) -> bool:
@@ -106,8 +119,12 @@ class ECMoveTT(BaseEC):
         -------
             bool: True操作成功,False操作失败
         """
-        return self.send_CMD(
-            "tt_put_servo_joint_to_buf", {"targetPose": pose}, ret_flag=self.TT_ret_flag
+        if self.codec.dumps_value is None:
+            return self.send_CMD(
+                "tt_put_servo_joint_to_buf", {"targetPose": pose}, ret_flag=self.TT_ret_flag
+            )
+        return self.send_compiled_CMD(
+            self._TT_ADD_POSE, pose, ret_flag=self.TT_ret_flag
         )
 
     def TT_clear_buff(self) -> bool:
@@ -0,0 +1,298 @@
+"""
+Description: Segmented binary recording of the 8056 monitor stream
+"""
+
+import glob
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Every segment starts with the magic and the length of the JSON header after it
+MAGIC = b"EC8056R1"
+HEADER_PREFIX = struct.Struct("!8sI")
+# Each record is the host receive time in ns since the epoch followed by the raw frame
+RECORD_TIME = struct.Struct("!Q")
+
+SEGMENT_SUFFIX = ".ec8056"
+
+
+def segment_header(
+    msg_size: int, layout: List[Tuple[str, str]], segment: int
+) -> Dict[str, Any]:
+    """JSON header written at the start of every segment"""
+    return {
+        "version": 1,
+        "msg_size": msg_size,
+        "record_size": RECORD_TIME.size + msg_size,
+        "byte_order": "!",
+        "layout": [list(field) for field in layout],
+        "segment": segment,
+        "created_ns": time.time_ns(),
+    }
+
+
+class MonitorRecorder:
+    """Append every 8056 frame to segmented files on disk
+
+    The monitor thread only copies each frame into a bounded queue, a
+    background thread writes them in batches. When the disk stalls long enough
+    to fill the queue, new frames are dropped and counted in `dropped` instead
+    of blocking the monitor.
+
+    Each segment file holds a header describing the frame layout followed by
+    fixed size records: receive time (uint64 ns, big-endian) then the raw frame.
+    A new segment is opened every `segment_frames` frames. Segments already in
+    `directory` with the same prefix are kept, numbering continues after them.
+
+    Args
+    ----
+        directory (str): Directory of the segment files, created if missing
+        layout (List[Tuple[str, str]]): Names and formats, `ECMonitorInfo._ec_struct` items
+        prefix (str, optional): Start of the segment file names. Defaults to "monitor".
+        segment_frames (int, optional): Frames per segment. Defaults to 75000, 10 min at 8 ms.
+        max_pending (int, optional): Frames buffered for the writer. Defaults to 1250, 10 s at 8 ms.
+
+    Examples
+    --------
+    >>> recorder = ec.start_monitor_recording("/data/robot1")
+    >>> ec.monitor_thread_run()
+    >>> ...
+    >>> ec.stop_monitor_recording()
+    >>> print(recorder.written, recorder.dropped, recorder.paths)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        layout: List[Tuple[str, str]],
+        prefix: str = "monitor",
+        segment_frames: int = 75000,
+        max_pending: int = 1250,
+    ) -> None:
+        if segment_frames < 1 or max_pending < 1:
+            raise ValueError("segment_frames and max_pending must be at least 1")
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.layout = list(layout)
+        self.prefix = prefix
+        self.segment_frames = segment_frames
+        self.paths: List[str] = []  # Segment files, oldest first
+        self.written = 0  # Frames written to disk
+        self.error: Optional[OSError] = None  # Write error that stopped the recording
+
+        # Each counter has a single writer thread, see `dropped`
+        self._full_dropped = 0  # Queue full, counted by the monitor thread
+        self._error_dropped = 0  # After a write error, counted by the writer thread
+        self._queue: queue.Queue[Optional[bytes]] = queue.Queue(max_pending)
+        # No frame is queued after the end sentinel once `_closed` is set
+        self._record_lock = threading.Lock()
+        self._closed = False
+        self._file: Any = None
+        self._segment_written = 0
+        self._next_segment = self._first_free_segment()
+        self._writer = threading.Thread(
+            target=self._write_loop, daemon=True, name="Elibot monitor recorder"
+        )
+        self._writer.start()
+
+    def record(self, frame: bytearray, recv_ns: int) -> None:
+        """Queue one frame, called by the monitor thread, never blocks
+
+        Args
+        ----
+            frame (bytearray): Whole received frame, copied before returning
+            recv_ns (int): Host receive time, `time.time_ns()`
+        """
+        with self._record_lock:
+            if self._closed:
+                return
+            try:
+                self._queue.put_nowait(RECORD_TIME.pack(recv_ns) + frame)
+            except queue.Full:
+                self._full_dropped += 1
+
+    def close(self) -> None:
+        """Write the frames still queued and close the current segment"""
+        with self._record_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    @property
+    def dropped(self) -> int:
+        """Frames lost because the queue was full or after a write error"""
+        return self._full_dropped + self._error_dropped
+
+    def __enter__(self) -> "MonitorRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _write_loop(self) -> None:
+        stop = False
+        while not stop:
+            records: List[Any] = [self._queue.get()]
+            while True:  # Everything already queued goes in the same write
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if records[-1] is None:  # Always last, see `close`
+                stop = True
+                records.pop()
+
+            if self.error is not None:
+                self._error_dropped += len(records)
+            elif records:
+                try:
+                    self._write(records)
+                except OSError as e:
+                    self.error = e
+                    self._error_dropped += len(records)
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, records: List[bytes]) -> None:
+        """Write records, rolling over to a new segment when the current one is full"""
+        while records:
+            if self._file is None or self._segment_written >= self.segment_frames:
+                self._open_segment(len(records[0]) - RECORD_TIME.size)
+            n = min(len(records), self.segment_frames - self._segment_written)
+            self._file.write(b"".join(records[:n]))
+            self._segment_written += n
+            self.written += n
+            records = records[n:]
+        self._file.flush()
+
+    def _first_free_segment(self) -> int:
+        """Number following the last segment already written with this prefix"""
+        start = self.prefix + "_"
+        last = -1
+        for name in os.listdir(self.directory):
+            number = name[len(start) : -len(SEGMENT_SUFFIX)]
+            if (
+                name.startswith(start)
+                and name.endswith(SEGMENT_SUFFIX)
+                and number.isdigit()
+            ):
+                last = max(last, int(number))
+        return last + 1
+
+    def _open_segment(self, msg_size: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        index = self._next_segment
+        path = os.path.join(
+            self.directory, f"{self.prefix}_{index:05d}{SEGMENT_SUFFIX}"
+        )
+        header = json.dumps(segment_header(msg_size, self.layout, index)).encode()
+        # Kept open across writes, never overwrites an earlier recording
+        self._file = open(path, "xb")  # noqa: SIM115
+        self._next_segment += 1
+        self._file.write(HEADER_PREFIX.pack(MAGIC, len(header)) + header)
+        self._segment_written = 0
+        self.paths.append(path)
+
+
+class MonitorRecording:
+    """Read only, memory-mapped access to segments written by `MonitorRecorder`
+
+    Segments are mapped rather than read, only the frames being accessed are
+    paged in, so recordings larger than the RAM can be replayed.
+
+    Args
+    ----
+        paths (Union[str, Sequence[str]]): Segment files, or a directory read in name order
+
+    Examples
+    --------
+    >>> with MonitorRecording("/data/robot1") as recording:
+    >>>     for recv_ns, frame in recording.frames():
+    >>>         ...
+    """
+
+    def __init__(self, paths: Union[str, Sequence[str]]) -> None:
+        if isinstance(paths, str):
+            if os.path.isdir(paths):
+                paths = sorted(glob.glob(os.path.join(paths, "*" + SEGMENT_SUFFIX)))
+            else:
+                paths = [paths]
+        if not paths:
+            raise FileNotFoundError("No recorded segment found")
+
+        self.paths = list(paths)
+        self._maps: List[mmap.mmap] = []
+        self._segments: List[Tuple[mmap.mmap, int, int]] = []  # Map, offset, frames
+        self.header: Dict[str, Any] = {}
+        try:
+            for path in self.paths:
+                self._map_segment(path)
+        except Exception:
+            self.close()
+            raise
+
+        self.msg_size: int = self.header["msg_size"]
+        self.layout: List[Tuple[str, str]] = [
+            (name, fmt) for name, fmt in self.header["layout"]
+        ]
+        self._record_size: int = self.header["record_size"]
+
+    def __len__(self) -> int:
+        return sum(count for _, _, count in self._segments)
+
+    def __enter__(self) -> "MonitorRecording":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def frames(self) -> Iterator[Tuple[int, bytes]]:
+        """Recorded frames in order
+
+        Yields
+        ------
+            Tuple[int, bytes]: Host receive time in ns and the raw frame
+        """
+        time_size, size = RECORD_TIME.size, self._record_size
+        unpack_time = RECORD_TIME.unpack_from
+        for data, offset, count in self._segments:
+            for start in range(offset, offset + count * size, size):
+                frame = data[start + time_size : start + size]
+                yield unpack_time(data, start)[0], frame
+
+    def close(self) -> None:
+        """Unmap every segment"""
+        for data in self._maps:
+            data.close()
+        self._maps.clear()
+        self._segments.clear()
+
+    def _map_segment(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(data)
+
+        magic, header_size = HEADER_PREFIX.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a recorded 8056 segment")
+        offset = HEADER_PREFIX.size + header_size
+        header = json.loads(data[HEADER_PREFIX.size : offset])
+        if not self.header:
+            self.header = header
+        elif header["msg_size"] != self.header["msg_size"]:
+            raise ValueError(f"{path} and {self.paths[0]} hold frames of other sizes")
+
+        # A segment cut by a crash ends with a partial record, it is ignored
+        count = (len(data) - offset) // header["record_size"]
+        self._segments.append((data, offset, count))
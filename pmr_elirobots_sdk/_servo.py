@@ -31,7 +31,7 @@ class ECServo(BaseEC):
         >>> ec = EC(ip="192.168.1.200", auto_connect=True)
         >>> print(ec.mode)  # => RobotMode.TECH
         """
-        return self.RobotMode(self.send_CMD("getRobotMode").result)
+        return self.RobotMode(self._monitor_or_send("robotMode", "getRobotMode").result)
 
     @property
     def state(self) -> BaseEC.RobotState:
@@ -51,7 +51,9 @@ class ECServo(BaseEC):
         >>> print(ec.state)  # => RobotState.STOP
         """
         try:
-            return self.RobotState(self.send_CMD("getRobotState").result)
+            return self.RobotState(
+                self._monitor_or_send("robotState", "getRobotState").result
+            )
         except ValueError:
             return self.RobotState.ERROR
 
@@ -63,7 +65,7 @@ class ECServo(BaseEC):
         -------
             int: 0: Not emergency stop, 1: Emergency stop
         """
-        return self.send_CMD("get_estop_status")
+        return self._monitor_or_send("emergencyStopState", "get_estop_status")
 
     @property
     def servo_status(self) -> CmdResponse:
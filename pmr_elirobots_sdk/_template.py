@@ -0,0 +1,76 @@
+"""
+Description: Pre-encoded request templates for high rate 8055 commands
+"""
+
+import json
+from typing import Any, Optional
+
+from pmr_elirobots_sdk._codec import DEFAULT_CODEC, JsonCodec
+
+
+class CmdTemplate:
+    """8055 request whose constant JSON parts are rendered once
+
+    Streaming commands such as `tt_put_servo_joint_to_buf` only change a short
+    numeric payload between calls. The request is rendered once around its
+    variable parameters and id, so each call only formats those numbers instead
+    of building a dict, running `json.dumps` and encoding the whole request.
+    Codecs without `dumps_value`, such as orjson, serialize the whole request
+    faster than the template is formatted, they are used as for any request.
+
+    Args
+    ----
+        cmd (str): Command
+        *slots (str): Names of the numeric parameters given on each call, in order
+        **params: Constant parameters
+
+    Examples
+    --------
+    >>> TT_ADD_JOINT = CmdTemplate("tt_put_servo_joint_to_buf", "targetPos")
+    >>> ec.send_compiled_CMD(TT_ADD_JOINT, joint)
+    """
+
+    __slots__ = ("cmd", "slots", "params", "_fmt")
+
+    def __init__(self, cmd: str, *slots: str, **params: Any) -> None:
+        self.cmd = cmd
+        self.slots = slots
+        self.params = params
+
+        marks = {name: f"@@{i}@@" for i, name in enumerate(slots)}
+        text = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": cmd,
+                "params": {**params, **marks},
+                "id": "@@id@@",
+            }
+        )
+        text = text.replace("%", "%%")
+        for mark in marks.values():
+            text = text.replace(f'"{mark}"', "%b")
+        self._fmt = (text.replace('"@@id@@"', "%d") + "\n").encode("ascii")
+
+    def __repr__(self) -> str:
+        return f"CmdTemplate({self.cmd!r}, {', '.join(map(repr, self.slots))})"
+
+    def encode(self, id: int, *values: Any, codec: Optional[JsonCodec] = None) -> bytes:
+        """Render one request frame
+
+        Args
+        ----
+            id (int): JSON-RPC request id
+            *values: Numbers or sequences of numbers, one per slot
+            codec (JsonCodec, optional): Serializes the values. Defaults to `DEFAULT_CODEC`.
+
+        Returns
+        -------
+            bytes: Newline terminated request
+        """
+        codec = codec or DEFAULT_CODEC
+        dumps = codec.dumps_value
+        if dumps is None:
+            params = {**self.params, **dict(zip(self.slots, values))}
+            request = {"jsonrpc": "2.0", "method": self.cmd, "params": params, "id": id}
+            return codec.dumps(request) + b"\n"
+        return self._fmt % (*map(dumps, values), id)
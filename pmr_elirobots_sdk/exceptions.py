@@ -0,0 +1,17 @@
+class ECConnectionError(ConnectionError):
+    """Connection to port 8055 was lost and could not be recovered"""
+
+
+class CommandNotRetriedError(ECConnectionError):
+    """Connection dropped while a non idempotent command was in flight
+
+    The connection has been recovered, but the command was not sent again since
+    the controller may already have executed it (e.g. a motion command). Check the
+    robot state before repeating it.
+    """
+
+    def __init__(self, cmd: str) -> None:
+        super().__init__(
+            f"CMD: {cmd} | Connection dropped before the reply, command not retried"
+        )
+        self.cmd = cmd
@@ -0,0 +1,172 @@
+"""
+Description: Stand-in 8056 server replaying frames recorded by MonitorRecorder
+
+Serves a recording as a live monitor stream, so `ECMonitor` and anything built
+on it can be run against an incident or a regression data set:
+
+    python -m pmr_elirobots_sdk.replay /data/robot1 --host 127.0.0.1 --speed 10
+
+Then `EC(ip="127.0.0.1").monitor_thread_run()` receives the recorded frames.
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence, Union
+
+from pmr_elirobots_sdk._recorder import MonitorRecording
+
+
+class _ReplayHandler(socketserver.BaseRequestHandler):
+    """One 8056 connection, the recording is streamed from its first frame"""
+
+    def handle(self) -> None:
+        replay: MonitorReplay = self.server.replay  # type: ignore[attr-defined]
+        try:
+            replay.stream(self.request.sendall)
+            while replay.loop and not replay.stopped:
+                replay.stream(self.request.sendall)
+            # Closing would make the monitor reconnect and replay again
+            while not replay.stopped:
+                time.sleep(0.05)
+        except OSError:
+            pass  # Client disconnected
+        except ValueError:
+            pass  # Recording unmapped by stop()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class MonitorReplay:
+    """8056 server streaming a recording instead of a live robot
+
+    Args
+    ----
+        paths (Union[str, Sequence[str]]): Segment files or directory written by `MonitorRecorder`
+        host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Monitor port. Defaults to 8056.
+        speed (float, optional): Speed relative to the recording, None unpaced. Defaults to 1.0.
+        loop (bool, optional): Restart at the end instead of idling connected. Defaults to False.
+
+    Examples
+    --------
+    >>> with MonitorReplay("/data/robot1", speed=4.0):
+    >>>     ec = EC(ip="127.0.0.1")
+    >>>     ec.monitor_thread_run()
+    """
+
+    def __init__(
+        self,
+        paths: Union[str, Sequence[str]],
+        host: str = "127.0.0.1",
+        port: int = 8056,
+        speed: Optional[float] = 1.0,
+        loop: bool = False,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for no pacing")
+        self.recording = MonitorRecording(paths)
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.loop = loop
+        self.stopped = False
+
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MonitorReplay":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> "MonitorReplay":
+        """Start serving in a background thread
+
+        Returns
+        -------
+            MonitorReplay: self
+        """
+        self.stopped = False
+        self._server = _Server((self.host, self.port), _ReplayHandler)
+        self._server.replay = self  # type: ignore[attr-defined]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=f"ec-replay-{self.host}:{self.port}",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and unmap the recording"""
+        self.stopped = True
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.recording.close()
+
+    def serve_forever(self) -> None:
+        """Serve until interrupted, blocking the calling thread"""
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stream(self, send: Callable[[bytes], Any]) -> int:
+        """Pass every recorded frame to `send`, paced by the recorded receive times
+
+        Args
+        ----
+            send (Callable[[bytes], Any]): Called with each raw frame, e.g. `socket.sendall`
+
+        Returns
+        -------
+            int: Number of frames sent
+        """
+        sent = 0
+        start = first_ns = None
+        for recv_ns, frame in self.recording.frames():
+            if self.stopped:
+                break
+            if self.speed is not None:
+                if start is None:
+                    start, first_ns = time.perf_counter(), recv_ns
+                delay = start + (recv_ns - first_ns) / 1e9 / self.speed
+                delay -= time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            send(frame)
+            sent += 1
+        return sent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded 8056 stream")
+    parser.add_argument("paths", nargs="+", help="Segment files or recording directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8056)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="0 sends frames back to back"
+    )
+    parser.add_argument("--loop", action="store_true")
+    args = parser.parse_args()
+
+    paths = args.paths[0] if len(args.paths) == 1 else args.paths
+    replay = MonitorReplay(paths, args.host, args.port, args.speed or None, args.loop)
+    print(f"Replaying {len(replay.recording)} frames on {args.host}:{args.port}")
+    replay.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
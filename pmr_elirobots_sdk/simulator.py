@@ -0,0 +1,757 @@
+"""
+Description: Simulated EC controller serving ports 8055 and 8056
+
+Lets the SDK, benchmarks and load tests run without a physical controller:
+
+    python -m pmr_elirobots_sdk.simulator --host 127.0.0.1 --latency 0.001
+
+Motion is interpolated in joint space and kinematics are not modeled, poses
+mirror the first six joint values.
+"""
+
+import argparse
+import collections
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from pmr_elirobots_sdk._monitor import ECMonitorInfo
+
+_STOP, _PAUSE, _PLAY = 0, 1, 3
+_REMOTE = 2
+
+
+class _RpcError(Exception):
+    """Error returned to the client instead of a result"""
+
+
+class _CmdHandler(socketserver.BaseRequestHandler):
+    """One 8055 connection, requests are answered in order
+
+    The replies to the requests received in one read are sent in a single write.
+    `latency` delays each reply from the arrival of its request without holding
+    up the requests after it, so pipelined requests overlap like on a network.
+    """
+
+    def setup(self) -> None:
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self) -> None:
+        sim: ECSimulator = self.server.simulator  # type: ignore[attr-defined]
+        writer = _DelayedWriter(self.request, sim.latency) if sim.latency else None
+        partial = b""
+        try:
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    break
+                arrival = time.perf_counter()
+                *lines, partial = (partial + data).split(b"\n")
+                replies = b"".join(
+                    reply
+                    for reply in map(sim.handle_request, lines)
+                    if reply is not None
+                )
+                if not replies:
+                    continue
+                if writer is None:
+                    self.request.sendall(replies)
+                else:
+                    writer.put(arrival, replies)
+        except OSError:
+            pass  # Client disconnected
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class _DelayedWriter:
+    """Sends reply batches once `latency` elapsed since their requests arrived"""
+
+    def __init__(self, sock: socket.socket, latency: float) -> None:
+        self._sock = sock
+        self._latency = latency
+        self._queue: Deque[Tuple[float, bytes]] = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, arrival: float, replies: bytes) -> None:
+        with self._cond:
+            self._queue.append((arrival + self._latency, replies))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Stop once the queued replies are sent"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                due = self._queue[0][0]
+
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            # Everything due by now leaves in one write
+            with self._cond:
+                now = time.perf_counter()
+                ready = []
+                while self._queue and self._queue[0][0] <= now:
+                    ready.append(self._queue.popleft()[1])
+            try:
+                self._sock.sendall(b"".join(ready))
+            except OSError:
+                return  # Client disconnected
+
+
+class _MonitorHandler(socketserver.BaseRequestHandler):
+    """One 8056 connection, a frame is pushed every period"""
+
+    def handle(self) -> None:
+        sim: ECSimulator = self.server.simulator  # type: ignore[attr-defined]
+        deadline = time.perf_counter()
+        try:
+            while not sim.stopped:
+                self.request.sendall(sim.monitor_frame())
+                deadline += sim.period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:  # Fell behind, keep the cadence from now on
+                    deadline = time.perf_counter()
+        except OSError:
+            pass  # Client disconnected
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ECSimulator:
+    """Simulated EC controller
+
+    Answers the 8055 JSON-RPC methods used by the SDK with a consistent robot
+    state (servo, modes, moves, transparent transmission, ML trajectories,
+    variables, IO and Profinet registers) and streams 8056 frames in the
+    `ECMonitorInfo` layout.
+
+    Args
+    ----
+        host (str, optional): Listen address, 127.0.0.N per robot. Defaults to "127.0.0.1".
+        cmd_port (int, optional): JSON-RPC port. Defaults to 8055.
+        monitor_port (Optional[int], optional): Monitor port, None disables it. Defaults to 8056.
+        latency (float, optional): Delay of each reply, in seconds. Defaults to 0.
+        period (float, optional): Interval between monitor frames, in seconds. Defaults to 0.008.
+
+    Examples
+    --------
+    >>> with ECSimulator("127.0.0.1", latency=0.001):
+    >>>     ec = EC("127.0.0.1", auto_connect=True)
+    >>>     ec.set_servo_status(1)
+    >>>     ec.move_joint([10, 0, 0, 0, 0, 0], speed=50)
+    """
+
+    max_joint_speed = 180.0  # deg/s at 100 % speed
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        cmd_port: int = 8055,
+        monitor_port: Optional[int] = 8056,
+        latency: float = 0.0,
+        period: float = 0.008,
+    ) -> None:
+        self.host = host
+        self.cmd_port = cmd_port
+        self.monitor_port = monitor_port
+        self.latency = latency
+        self.period = period
+        self.stopped = False
+
+        self._lock = threading.Lock()
+        self._servers: List[_Server] = []
+        self._threads: List[threading.Thread] = []
+        self._struct = struct.Struct("!" + "".join(ECMonitorInfo._ec_struct.values()))
+
+        self.mode = _REMOTE
+        self.state = _STOP
+        self.servo = False
+        self.speed = 10.0
+        self.cycle_mode = 0
+        self.tool_num = 0
+        self.user_num = 0
+        self.coord = 0
+        self.joint = [0.0] * 8
+        self.collision = 0
+        self.estop = 0
+        self._motion: Optional[tuple] = None  # (start, target, start time, duration)
+        self._paused_target: Optional[List[float]] = None
+        self._motion_speed = [0.0] * 8
+
+        self.sys_vars: Dict[str, list] = {
+            "B": [0] * 256,
+            "I": [0] * 256,
+            "D": [0.0] * 256,
+            "P": [[0.0] * 8 for _ in range(256)],
+            "V": [[0.0] * 6 for _ in range(256)],
+        }
+        self.digital_input = [0] * 128
+        self.digital_output = [0] * 128
+        self.virtual_io = [0] * 1536
+        self.analog_input = [0.0] * 3
+        self.analog_output = [0.0] * 5
+        self.profinet: Dict[str, list] = {
+            "int_input": [0] * 64,
+            "int_output": [0] * 64,
+            "float_input": [0.0] * 64,
+            "float_output": [0.0] * 64,
+        }
+        self.payload: Dict[int, list] = {i: [0.0, [0.0, 0.0, 0.0]] for i in range(8)}
+
+        self.tt_enabled = False
+        self.tt_response = True
+        self.tt_points = 0
+        self.ml_length = 0
+        self.ml_ret_flag = 1
+        self.ml_points: List[tuple] = []
+
+        self._handlers: Dict[str, Callable[[dict], Any]] = self._build_handlers()
+
+    def __enter__(self) -> "ECSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # Servers
+    def start(self) -> "ECSimulator":
+        """Start serving in background threads
+
+        Returns
+        -------
+            ECSimulator: self
+        """
+        self.stopped = False
+        ports = [(self.cmd_port, _CmdHandler)]
+        if self.monitor_port is not None:
+            ports.append((self.monitor_port, _MonitorHandler))
+
+        for port, handler in ports:
+            server = _Server((self.host, port), handler)
+            server.simulator = self  # type: ignore[attr-defined]
+            thread = threading.Thread(
+                target=server.serve_forever,
+                name=f"ec-sim-{self.host}:{port}",
+                daemon=True,
+            )
+            thread.start()
+            self._servers.append(server)
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening sockets"""
+        self.stopped = True
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+        self._threads.clear()
+
+    def serve_forever(self) -> None:
+        """Serve until interrupted, blocking the calling thread"""
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # Port 8055
+    def handle_request(self, line: bytes) -> Optional[bytes]:
+        """Answer one JSON-RPC request
+
+        Args
+        ----
+            line (bytes): Request frame
+
+        Returns
+        -------
+            Optional[bytes]: Reply frame, None for requests sent without reply
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            reply = {
+                "jsonrpc": "2.0",
+                "error": _error(-32700, "Parse error"),
+                "id": None,
+            }
+            return json.dumps(reply).encode("utf-8") + b"\n"
+
+        method = request.get("method")
+        params = request.get("params") or {}
+
+        handler = self._handlers.get(method)
+        if handler is None:
+            error = _error(-32601, "Method not found")
+        else:
+            try:
+                with self._lock:
+                    self._advance(time.perf_counter())
+                    result = handler(params)
+            except _RpcError as e:
+                error = _error(-32602, str(e))
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                error = _error(-32602, f"Invalid params: {e}")
+            else:
+                if not self._replies(method, params):
+                    return None
+                reply = {
+                    "jsonrpc": "2.0",
+                    "result": json.dumps(result),
+                    "id": request.get("id"),
+                }
+                return json.dumps(reply).encode("utf-8") + b"\n"
+
+        reply = {"jsonrpc": "2.0", "error": error, "id": request.get("id")}
+        return json.dumps(reply).encode("utf-8") + b"\n"
+
+    def _replies(self, method: str, params: dict) -> bool:
+        """Whether the controller answers this request, streaming points may not"""
+        if method == "tt_put_servo_joint_to_buf":
+            return self.tt_response
+        if method == "push_pos":
+            return bool(self.ml_ret_flag)
+        return True
+
+    # Port 8056
+    def monitor_frame(self) -> bytes:
+        """Encode the current robot state as one 8056 frame"""
+        with self._lock:
+            now = time.perf_counter()
+            self._advance(now)
+            joint = self.joint
+            pose = joint[:6]
+            speed = self._motion_speed
+            digital_in = _pack_bits(self.digital_input[:64])
+            digital_out = _pack_bits(self.digital_output[:64])
+            values = (
+                self._struct.size,
+                int(time.time() * 1000),
+                self.cycle_mode,
+                *joint,
+                *pose,
+                *pose,
+                *[0.0] * 8,  # torque
+                self.state,
+                int(self.servo),
+                int(self.servo),
+                *[int(v * 1000) for v in speed],
+                self.mode,
+                *self.analog_input,
+                *self.analog_output,
+                digital_in,
+                digital_out,
+                self.collision,
+                *pose,
+                *pose,
+                self.estop,
+                0.0,  # tcp_speed
+                *speed,
+                0.0,  # tcpacc
+                *[0.0] * 8,
+            )
+        return self._struct.pack(*values)
+
+    # Motion
+    def _advance(self, now: float) -> None:
+        """Move the joints along the current motion up to `now`"""
+        if self._motion is None:
+            self._motion_speed = [0.0] * 8
+            return
+
+        start, target, t0, duration = self._motion
+        ratio = min((now - t0) / duration, 1.0) if duration > 0 else 1.0
+        self.joint = [s + (t - s) * ratio for s, t in zip(start, target)]
+        if ratio >= 1.0:
+            self._motion = None
+            self.state = _STOP
+            self._motion_speed = [0.0] * 8
+        else:
+            self._motion_speed = [(t - s) / duration for s, t in zip(start, target)]
+
+    def _start_motion(self, target: List[float], speed: float) -> bool:
+        if not self.servo or self.mode != _REMOTE or self.state == _PLAY:
+            return False
+        target = [float(v) for v in target] + self.joint[len(target) :]
+        distance = max(abs(t - s) for s, t in zip(self.joint, target))
+        rate = self.max_joint_speed * max(min(speed, 100.0), 0.01) / 100.0
+        self._motion = (list(self.joint), target, time.perf_counter(), distance / rate)
+        self.state = _PLAY
+        return True
+
+    def _stop_motion(self, params: dict) -> bool:
+        self._motion = self._paused_target = None
+        self.state = _STOP
+        return True
+
+    def _pause(self, params: dict) -> bool:
+        if self._motion is None:
+            return False
+        # The rest of the path is resumed from the current position
+        self._paused_target = self._motion[1]
+        self._motion = None
+        self.state = _PAUSE
+        return True
+
+    def _resume(self, params: dict) -> bool:
+        if self.state != _PAUSE or self._paused_target is None:
+            return False
+        target, self._paused_target = self._paused_target, None
+        self.state = _STOP
+        return self._start_motion(target, self.speed)
+
+    # Handlers
+    def _build_handlers(self) -> Dict[str, Callable[[dict], Any]]:
+        def const(value: Any) -> Callable[[dict], Any]:
+            return lambda params: value
+
+        def getter(name: str) -> Callable[[dict], Any]:
+            return lambda params: getattr(self, name)
+
+        def setter(name: str, key: str, cast: Callable = int) -> Callable[[dict], Any]:
+            def set_value(params: dict) -> bool:
+                setattr(self, name, cast(params[key]))
+                return True
+
+            return set_value
+
+        handlers: Dict[str, Callable[[dict], Any]] = {
+            # Servo
+            "getRobotMode": getter("mode"),
+            "getRobotState": getter("state"),
+            "get_estop_status": getter("estop"),
+            "getServoStatus": lambda p: self.servo,
+            "set_servo_status": self._set_servo,
+            "syncMotorStatus": const(True),
+            "getMotorStatus": const(True),
+            "clearAlarm": self._clear_alarm,
+            "calibrate_encoder_zero_position": const(True),
+            "get_servo_precise_position_status": const(True),
+            # Info
+            "getSoftVersion": const("3.0.0"),
+            "getJointVersion": const(11),
+            "getRobotType": const(0),
+            "getRobotSubtype": const(6),
+            "getRobotPos": lambda p: self.joint,
+            "get_joint_pos": lambda p: self.joint,
+            "get_motor_pos": lambda p: self.joint,
+            "getRobotPose": lambda p: self.joint[:6],
+            "get_tcp_pose": lambda p: self.joint[:6],
+            "getTcpPoseInUser": lambda p: self.joint[:6],
+            "get_base_flange_pose": lambda p: self.joint[:6],
+            "get_user_flange_pose": lambda p: self.joint[:6],
+            "get_joint_speed": lambda p: self._motion_speed,
+            "get_motor_speed": lambda p: self._motion_speed,
+            "getMotorSpeed": lambda p: self._motion_speed,
+            "get_joint_acc": const([0.0] * 8),
+            "get_tcp_speed": const(0.0),
+            "get_tcp_acc": const(0.0),
+            "getRobotTorques": const([0.0] * 8),
+            "getCurrentEncode": lambda p: [int(v * 1000) for v in self.joint],
+            "getSpeed": getter("speed"),
+            "setSpeed": setter("speed", "value", float),
+            "getCycleMode": getter("cycle_mode"),
+            "setCycleMode": setter("cycle_mode", "cycle_mode"),
+            "getCurrentCoord": getter("coord"),
+            "setCurrentCoord": setter("coord", "coord_mode"),
+            "getToolNumber": getter("tool_num"),
+            "setToolNumber": setter("tool_num", "tool_num"),
+            "getAutoRunToolNumber": getter("tool_num"),
+            "setAutoRunToolNumber": setter("tool_num", "tool_num"),
+            "getUserNumber": getter("user_num"),
+            "setUserNumber": setter("user_num", "user_num"),
+            "getTcpPos": const([0.0] * 6),
+            "getUserFrame": const([0.0] * 6),
+            "setUserFrame": const(True),
+            "getPayload": lambda p: self.payload[int(p["tool_num"])][0],
+            "getCentreMass": lambda p: self.payload[int(p["tool_num"])][1],
+            "get_tool_payload": self._get_payload,
+            "cmd_set_payload": self._set_payload,
+            "getCollisionState": getter("collision"),
+            "resetCollisionState": self._reset_collision,
+            "setCollisionEnable": const(True),
+            "get_collision_enable_status": const(1),
+            "setCollisionSensitivity": const(True),
+            "getCollisionSensitivity": const(50),
+            "getAlarmNum": const([0, 0]),
+            "getDH": const(0.0),
+            "get_remote_sys_password": const("0" * 32),
+            "getRobotDragStartupMaxSpeed": const(0.0),
+            "getRobotTorqueErrorMaxPercents": const(0.0),
+            "getRobotSafetyParamsEnabled": const(0),
+            "getRobotSafeyPower": const(0.0),
+            "getRobotSafetyMomentum": const(0.0),
+            "getRobotSafetyToolForce": const(0.0),
+            "getRobotSafetyElbowForce": const(0.0),
+            "getRobotSpeedPercentage": const(0.0),
+            "checkFlangeButton": const(0),
+            "setFlangeButton": const(True),
+            "drag_teach_switch": const(True),
+            "setSafetyParams": const(True),
+            # Move
+            "moveByJoint": lambda p: self._start_motion(p["targetPos"], p["speed"]),
+            "moveByLine": lambda p: self._start_motion(p["targetPos"], p["speed"]),
+            "moveByArc": lambda p: self._start_motion(p["targetPos"], p["speed"]),
+            "moveByLineCoord": const(True),
+            "moveBySpeedj": const(True),
+            "moveBySpeedl": const(True),
+            "stopj": self._stop_motion,
+            "stopl": self._stop_motion,
+            "jog": const(True),
+            "stop": self._stop_motion,
+            "pause": self._pause,
+            "run": self._resume,
+            "checkJbiExist": const(0),
+            "runJbi": const(False),
+            "getJbiState": const({"jbiName": "", "runState": 0}),
+            "addPathPoint": const(True),
+            "clearPathPoint": const(True),
+            "moveByPath": const(0),
+            "getPathPointIndex": const(-1),
+            # Kinematics
+            "inverseKinematic": lambda p: (list(p["targetPose"]) + [0.0, 0.0])[:8],
+            "positiveKinematic": lambda p: list(p["targetPos"])[:6],
+            "poseMul": lambda p: [a + b for a, b in zip(p["pose1"], p["pose2"])],
+            "poseInv": lambda p: [-v for v in p["pose"]],
+            "convertPoseFromCartToUser": lambda p: p["TargetPose"],
+            "convertPoseFromUserToCart": lambda p: p["TargetPose"],
+            # Transparent transmission
+            "transparent_transmission_init": self._tt_init,
+            "tt_set_current_servo_joint": self._tt_point,
+            "tt_put_servo_joint_to_buf": self._tt_point,
+            "tt_clear_servo_joint_buf": self._tt_clear,
+            "get_transparent_transmission_state": lambda p: int(self.tt_enabled),
+            # ML
+            "start_push_pos": self._ml_init,
+            "push_pos": self._ml_push,
+            "stop_push_pos": lambda p: len(self.ml_points) == self.ml_length,
+            "check_trajectory": self._ml_check,
+            "flush_trajectory": self._ml_flush,
+            "start_trajectory": self._ml_run,
+            "pause_trajectory": self._pause,
+            "resume_trajectory": self._resume,
+            "stop_trajectory": self._stop_motion,
+            # Vars and IO
+            "getSysVarPState": const(1),
+            "save_var_data": const(True),
+            "getInput": lambda p: self.digital_input[int(p["addr"])],
+            "getOutput": lambda p: self.digital_output[int(p["addr"])],
+            "setOutput": self._set_output,
+            "getVirtualInput": lambda p: self.virtual_io[int(p["addr"])],
+            "getVirtualOutput": lambda p: self.virtual_io[int(p["addr"])],
+            "setVirtualOutput": self._set_virtual_output,
+            "getRegisters": self._get_registers,
+            "getAnalogInput": lambda p: self.analog_input[int(p["addr"])],
+            "get_analog_output": lambda p: self.analog_output[int(p["addr"])],
+            "setAnalogOutput": self._set_analog_output,
+        }
+
+        for var_type in self.sys_vars:
+            handlers["getSysVar" + var_type] = self._var_getter(var_type)
+            handlers["setSysVar" + var_type] = self._var_setter(var_type)
+
+        for kind in ("int", "float"):
+            for direction in ("input", "output"):
+                name = f"{kind}_{direction}"
+                handlers[f"get_profinet_{name}_registers"] = self._profinet_getter(name)
+            handlers[f"set_profinet_{kind}_output_registers"] = self._profinet_setter(
+                f"{kind}_output"
+            )
+        return handlers
+
+    def _set_servo(self, params: dict) -> bool:
+        if self.state == _PLAY:
+            return False
+        self.servo = bool(params["status"])
+        return True
+
+    def _clear_alarm(self, params: dict) -> bool:
+        if self.state in (2, 4, 5):
+            self.state = _STOP
+        return True
+
+    def _reset_collision(self, params: dict) -> bool:
+        self.collision = 0
+        return self._clear_alarm(params)
+
+    def _get_payload(self, params: dict) -> dict:
+        mass, cog = self.payload[int(params["tool_num"])]
+        return {"m": mass, "tool_cog": cog}
+
+    def _set_payload(self, params: dict) -> bool:
+        self.payload[int(params["tool_num"])] = [
+            float(params.get("m", 0.0)),
+            list(params.get("cog", [0.0, 0.0, 0.0])),
+        ]
+        return True
+
+    def _tt_init(self, params: dict) -> bool:
+        if not self.servo or self.mode != _REMOTE:
+            return False
+        self.tt_enabled = True
+        self.tt_response = bool(params.get("response_enable", 1))
+        self.tt_points = 0
+        return True
+
+    def _tt_point(self, params: dict) -> bool:
+        if not self.tt_enabled:
+            return False
+        if "targetPos" in params:
+            target = [float(v) for v in params["targetPos"]]
+            self.joint = target + self.joint[len(target) :]
+        self.tt_points += 1
+        return True
+
+    def _tt_clear(self, params: dict) -> bool:
+        self.tt_enabled = False
+        self.tt_points = 0
+        return True
+
+    def _ml_init(self, params: dict) -> bool:
+        self.ml_length = int(params["path_lenth"])
+        self.ml_ret_flag = int(params.get("ret_flag", 1))
+        self.ml_points = []
+        return True
+
+    def _ml_push(self, params: dict) -> bool:
+        if len(self.ml_points) >= self.ml_length:
+            return False
+        self.ml_points.append((float(params["timestamp"]), list(params["pos"])))
+        return True
+
+    def _ml_check(self, params: dict) -> int:
+        if len(self.ml_points) != self.ml_length:
+            return -1
+        stamps = [stamp for stamp, _ in self.ml_points]
+        if stamps and (stamps[0] != 0 or stamps != sorted(stamps)):
+            return -3
+        return 0
+
+    def _ml_flush(self, params: dict) -> bool:
+        self.ml_points = []
+        return True
+
+    def _ml_run(self, params: dict) -> bool:
+        if not self.ml_points or self._ml_check(params) != 0:
+            return False
+        duration, target = self.ml_points[-1]
+        if not self._start_motion(target, 100.0):
+            return False
+        start, target, t0, _ = self._motion  # type: ignore[misc]
+        speed_percent = float(params.get("speed_percent", 1.0))
+        self._motion = (start, target, t0, duration / max(speed_percent, 0.001))
+        return True
+
+    def _set_output(self, params: dict) -> bool:
+        self.digital_output[int(params["addr"])] = int(params["status"])
+        return True
+
+    def _set_virtual_output(self, params: dict) -> bool:
+        self.virtual_io[int(params["addr"])] = int(params["status"])
+        return True
+
+    def _get_registers(self, params: dict) -> List[int]:
+        addr, length = int(params["addr"]), int(params["len"])
+        words = []
+        for word in range(length):
+            start = addr + word * 16
+            words.append(_pack_bits(self.virtual_io[start : start + 16]))
+        return words
+
+    def _set_analog_output(self, params: dict) -> bool:
+        self.analog_output[int(params["addr"])] = float(params["value"])
+        return True
+
+    def _var_getter(self, var_type: str) -> Callable[[dict], Any]:
+        return lambda params: self.sys_vars[var_type][int(params["addr"])]
+
+    def _var_setter(self, var_type: str) -> Callable[[dict], Any]:
+        key = {"P": "pos", "V": "pose"}.get(var_type, "value")
+
+        def set_var(params: dict) -> bool:
+            self.sys_vars[var_type][int(params["addr"])] = params[key]
+            return True
+
+        return set_var
+
+    def _profinet_getter(self, name: str) -> Callable[[dict], Any]:
+        def get_registers(params: dict) -> list:
+            addr, length = int(params["addr"]), int(params["length"])
+            if addr + length > len(self.profinet[name]):
+                raise _RpcError("Register range out of bounds")
+            return self.profinet[name][addr : addr + length]
+
+        return get_registers
+
+    def _profinet_setter(self, name: str) -> Callable[[dict], Any]:
+        def set_registers(params: dict) -> bool:
+            addr, length = int(params["addr"]), int(params["length"])
+            values = list(params["value"])[:length]
+            if addr + len(values) > len(self.profinet[name]):
+                raise _RpcError("Register range out of bounds")
+            self.profinet[name][addr : addr + len(values)] = values
+            return True
+
+        return set_registers
+
+
+def _error(code: int, message: str) -> dict:
+    return {"code": code, "message": message}
+
+
+def _pack_bits(bits: List[int]) -> int:
+    """Pack a list of 0/1 values into an integer, first value as lowest bit"""
+    value = 0
+    for i, bit in enumerate(bits):
+        if bit:
+            value |= 1 << i
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulated EC controller")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--cmd-port", type=int, default=8055)
+    parser.add_argument("--monitor-port", type=int, default=8056)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--period", type=float, default=0.008)
+    args = parser.parse_args()
+
+    sim = ECSimulator(
+        args.host, args.cmd_port, args.monitor_port, args.latency, args.period
+    )
+    print(f"Simulated controller on {args.host}:{args.cmd_port}/{args.monitor_port}")
+    sim.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
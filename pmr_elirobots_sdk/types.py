@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, cast
+from typing import Any, FrozenSet, Tuple, Union
 
 
 @dataclass
@@ -8,9 +8,117 @@ class CmdResponse:
 
     success: bool
     result: Any
-    id: str
+    id: Union[int, str]
 
     def __bool__(self):
         if not isinstance(self.result, bool):
             raise TypeError("Trying to auto convert to bool a non bool value")
         return self.success and self.result
+
+
+@dataclass
+class DrainStats:
+    """Replies on port 8055 that no command was waiting for"""
+
+    deferred: int = 0
+    """Replies to commands sent with `ret_flag=False`, or answered after a timeout"""
+    unsolicited: int = 0
+    """Replies whose id was never issued on the current connection"""
+
+
+@dataclass(frozen=True)
+class LatencyHistogram:
+    """Distribution of durations in fixed power of two buckets"""
+
+    bounds_us: Tuple[int, ...]
+    """Upper bound of each bucket in µs, the last bucket has no upper bound"""
+    counts: Tuple[int, ...]
+    """Number of durations in each bucket"""
+    total_ns: int
+    """Sum of all durations, in ns"""
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean_us(self) -> float:
+        count = self.count
+        return self.total_ns / count / 1000 if count else 0.0
+
+    def percentile_us(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile `q` (0 to 1), in µs"""
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds_us, self.counts):
+            seen += n
+            if n and seen >= target:
+                return float(bound)
+        return float("inf") if self.counts[-1] else 0.0
+
+
+@dataclass(frozen=True)
+class MethodMetrics:
+    """Calls of one controller method recorded by `CmdMetrics`"""
+
+    count: int
+    errors: int
+    """Calls that raised or got an error reply"""
+    send: LatencyHistogram
+    wait: LatencyHistogram
+    decode: LatencyHistogram
+
+
+@dataclass(frozen=True)
+class MonitorStats:
+    """Frame loss and timing of the 8056 stream recorded by `MonitorMetrics`"""
+
+    frames: int
+    """Frames received and decoded"""
+    lost: int
+    """Frames missing between consecutive controller TimeStamps"""
+    gaps: int
+    """Intervals with at least one missing frame"""
+    reconnects: int
+    """Connections re-established after a cut or malformed frame"""
+    controller_jitter: LatencyHistogram
+    """Deviation of TimeStamp intervals from a whole number of periods"""
+    host_jitter: LatencyHistogram
+    """Deviation of host receive intervals from the TimeStamp intervals"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Reconnection and retry behaviour of port 8055"""
+
+    max_attempts: int = 5
+    """Connection attempts before giving up, also bounds the retries of a command"""
+    initial_backoff: float = 0.01
+    """Delay before the second connection attempt, in seconds"""
+    max_backoff: float = 1.0
+    """Upper bound of the delay between connection attempts, in seconds"""
+    multiplier: float = 2.0
+    """Backoff growth factor between consecutive attempts"""
+    retry_idempotent: bool = True
+    """Whether idempotent commands are sent again after reconnecting"""
+    idempotent_prefixes: Tuple[str, ...] = ("get", "check")
+    """Commands starting with these prefixes only query the controller"""
+    idempotent_cmds: FrozenSet[str] = frozenset(
+        {
+            "inverseKinematic",
+            "positiveKinematic",
+            "poseMul",
+            "poseInv",
+            "convertPoseFromCartToUser",
+            "convertPoseFromUserToCart",
+        }
+    )
+    """Other commands that are safe to send twice"""
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before connection attempt number `attempt + 1`, in seconds"""
+        return min(self.initial_backoff * self.multiplier**attempt, self.max_backoff)
+
+    def is_idempotent(self, cmd: str) -> bool:
+        """Whether sending `cmd` twice has the same effect as sending it once"""
+        return cmd.startswith(self.idempotent_prefixes) or cmd in self.idempotent_cmds
@@ -0,0 +1,70 @@
+import socket
+
+import pytest
+
+from pmr_elirobots_sdk._framing import FrameReader
+
+
+@pytest.fixture
+def pair():
+    client, server = socket.socketpair()
+    yield client, server
+    client.close()
+    server.close()
+
+
+def test_partial_frame(pair):
+    client, server = pair
+    reader = FrameReader(client)
+    server.sendall(b'{"id": 1, ')
+    reader.fill()
+    assert reader.next_frame() is None
+    assert reader.buffered == 10
+
+    server.sendall(b'"result": true}\n')
+    assert reader.read_frame() == b'{"id": 1, "result": true}'
+    assert reader.buffered == 0
+
+
+def test_coalesced_frames(pair):
+    client, server = pair
+    reader = FrameReader(client)
+    server.sendall(b"first\nsecond\nthi")
+    reader.fill()
+    assert reader.next_frame() == b"first"
+    assert reader.next_frame() == b"second"
+    assert reader.next_frame() is None
+    assert reader.buffered == 3
+
+    server.sendall(b"rd\n")
+    assert reader.read_frame() == b"third"
+
+
+def test_oversized_frame(pair):
+    client, server = pair
+    reader = FrameReader(client, bufsize=16)
+    big = b"x" * 1000
+    server.sendall(big + b"\nnext\n")
+    assert reader.read_frame() == big
+    assert reader.read_frame() == b"next"
+
+
+def test_partial_frame_moved_to_buffer_start(pair):
+    client, server = pair
+    reader = FrameReader(client, bufsize=8)
+    server.sendall(b"abc\ndefg")
+    reader.fill()
+    assert reader.next_frame() == b"abc"
+
+    # The buffer is full, "defg" is moved to its start before the next receive
+    server.sendall(b"h\n")
+    assert reader.read_frame() == b"defgh"
+
+
+def test_closed_connection(pair):
+    client, server = pair
+    reader = FrameReader(client)
+    server.sendall(b"unterminated")
+    server.close()
+    with pytest.raises(ConnectionError):
+        reader.read_frame()
@@ -0,0 +1,126 @@
+import asyncio
+import socket
+import statistics
+import threading
+import time
+
+import pytest
+
+from pmr_elirobots_sdk import EC, AsyncEC
+from pmr_elirobots_sdk.simulator import ECSimulator
+
+HOST = "127.0.0.1"
+LATENCY = 0.005
+
+
+def connect(port: int) -> EC:
+    ec = EC(HOST, enable_log=False)
+    assert ec.connect_ETController(HOST, port)[0]
+    return ec
+
+
+@pytest.fixture
+def sim():
+    with ECSimulator(HOST, cmd_port=18155, monitor_port=None) as sim:
+        sim.sys_vars["I"] = [7 * i for i in range(256)]
+        yield sim
+
+
+@pytest.fixture
+def slow_sim():
+    with ECSimulator(HOST, cmd_port=18156, monitor_port=None, latency=LATENCY) as sim:
+        yield sim
+
+
+@pytest.fixture
+def reversing_sim():
+    """Simulator answering each group of 3 requests in reverse order"""
+    sim = ECSimulator(HOST, cmd_port=18157, monitor_port=None)
+    listener = socket.create_server((HOST, sim.cmd_port))
+
+    def serve() -> None:
+        conn, _ = listener.accept()
+        with conn:
+            buf = b""
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                *lines, buf = (buf + data).split(b"\n")
+                while len(lines) >= 3:
+                    group, lines = lines[:3], lines[3:]
+                    conn.sendall(b"".join(map(sim.handle_request, reversed(group))))
+                buf = b"\n".join(lines + [buf])
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield sim
+    listener.close()
+
+
+def median_ms(call, n: int = 5) -> float:
+    call()
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def test_out_of_order_replies(reversing_sim):
+    reversing_sim.sys_vars["I"][:3] = [10, 20, 30]
+    ec = connect(reversing_sim.cmd_port)
+    pending = [ec.submit_CMD("getSysVarI", {"addr": i}) for i in (2, 0, 1)]
+    # Collected in another order than they were sent and answered
+    assert [p.wait().result for p in reversed(pending)] == [20, 10, 30]
+    ec.disconnect_ETController()
+
+
+def test_concurrent_callers(sim):
+    ec = connect(sim.cmd_port)
+    errors = []
+
+    def call(addr: int) -> None:
+        for _ in range(50):
+            response = ec.send_CMD("getSysVarI", {"addr": addr})
+            if response.result != 7 * addr:
+                errors.append((addr, response))
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    ec.disconnect_ETController()
+
+
+def test_concurrent_getters_single_round_trip(slow_sim):
+    ec = connect(slow_sim.cmd_port)
+    serial = median_ms(lambda: [ec.send_CMD("getDH", {"index": i}) for i in range(3)])
+    batch = median_ms(lambda: ec.DH_parameters)
+    pipelined = median_ms(
+        lambda: [p.wait() for p in [ec.submit_CMD("getRobotState") for _ in range(3)]]
+    )
+    ec.disconnect_ETController()
+
+    # One round trip each, Nagle and delayed ACK used to add ~40 ms
+    assert serial >= 3 * LATENCY * 1000
+    assert batch < 2 * LATENCY * 1000
+    assert pipelined < 2 * LATENCY * 1000
+
+
+def test_async_getters_single_round_trip(slow_sim):
+    async def measure() -> float:
+        ec = AsyncEC(HOST, enable_log=False)
+        assert (await ec.connect_ETController(HOST, slow_sim.cmd_port))[0]
+        samples = []
+        for _ in range(6):
+            start = time.perf_counter()
+            await asyncio.gather(*(ec.send_CMD("getRobotState") for _ in range(3)))
+            samples.append(time.perf_counter() - start)
+        await ec.disconnect_ETController()
+        return statistics.median(samples[1:]) * 1000
+
+    assert asyncio.run(measure()) < 2 * LATENCY * 1000